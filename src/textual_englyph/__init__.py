@@ -1,8 +1,40 @@
-"""Connect local module file to module name"""                                                                     
+"""Connect local module file to module name, loading each widget module on first use"""
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from ._englyph_image import EnGlyphImage
-from ._englyph_text import EnGlyphText
-from ._englyph_sprite import EnGlyphSprite
-from ._englyph_seven_segment import EnSevSeg
+if TYPE_CHECKING:
+    from ._englyph_image import EnGlyphImage
+    from ._englyph_text import EnGlyphText
+    from ._englyph_sprite import EnGlyphSprite
+    from ._englyph_pane import EnGlyphPane
+    from ._englyph_canvas import EnGlyphCanvas
+    from ._englyph_chart import EnGlyphChart
+    from ._englyph_seven_segment import EnSevSeg
+    from .englyph import frame_budget, asset_loader, AdaptiveQuality
 
-__all__ = ["EnGlyphImage", "EnGlyphText", "EnSevSeg"]
+_lazy_modules = {
+    "EnGlyphImage": "._englyph_image",
+    "EnGlyphText": "._englyph_text",
+    "EnGlyphSprite": "._englyph_sprite",
+    "EnGlyphPane": "._englyph_pane",
+    "EnGlyphCanvas": "._englyph_canvas",
+    "EnGlyphChart": "._englyph_chart",
+    "EnSevSeg": "._englyph_seven_segment",
+    "frame_budget": ".englyph",
+    "asset_loader": ".englyph",
+    "AdaptiveQuality": ".englyph",
+}
+
+__all__ = ["EnGlyphImage", "EnGlyphText", "EnGlyphSprite", "EnGlyphPane", "EnGlyphCanvas", "EnGlyphChart", "EnSevSeg", "frame_budget", "asset_loader", "AdaptiveQuality"]
+
+
+def __getattr__(name: str):
+    if name not in _lazy_modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_lazy_modules[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
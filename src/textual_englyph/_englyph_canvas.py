@@ -0,0 +1,293 @@
+"""Draw directly at glyxel resolution for Textual with custom widget EnGlyph"""
+from rich.color import Color
+from rich.segment import Segment
+from rich.style import Style
+
+from textual.geometry import Region
+from textual.strip import Strip
+
+from .englyph import EnGlyph
+from .toglyxels import ToGlyxels
+
+
+class GlyxelBuffer():
+    """
+    A glyxel resolution RGB framebuffer, three bytes per glyxel in row major order.
+    Draw primitives mark the cells they touch, and only those cells are encoded
+    again, through the full_glut or pips_glut table of the basis, when the slate is read.
+    """
+
+    # encoded cells by their glyxel bytes, shared by every buffer of a basis and glyph table
+    _cell_cache = {}
+    cell_cache_max = 65536
+
+    def __init__( self, size=(0, 0), basis=(2, 4), pips=False, background=(0, 0, 0) ):
+        glut = ToGlyxels.pips_glut if pips else ToGlyxels.full_glut
+        if basis[0] > len(glut) - 1 or basis[0] < 1:
+            raise ValueError(f'Basis 0 must be between 1 and {len(glut) - 1}')
+        if basis[1] > len(glut[basis[0]]) - 1 or not glut[basis[0]][basis[1]]:
+            raise ValueError(f'Basis {basis} has no glyph table')
+        self.basis = basis
+        self.pips = pips
+        self._glyphs = glut[basis[0]][basis[1]]
+        self._cells_key = ( basis, pips )
+        self.background = self.rgb( background )
+        self.size = (0, 0)
+        self.pixels = bytearray()
+        self._segments = []
+        self._strips = []
+        self._dirty = {} # cell row -> set of cell columns
+        self.resize( size )
+
+    @staticmethod
+    def rgb( color ) -> bytes:
+        """The three RGB bytes of an (r, g, b) tuple, 0xRRGGBB int or Rich color name"""
+        if isinstance( color, int ):
+            return color.to_bytes( 3, "big" )
+        if isinstance( color, str ):
+            color = Color.parse( color ).get_truecolor()
+        return bytes( color[:3] )
+
+    @property
+    def cells(self) -> tuple:
+        """The (columns, rows) size in terminal cells"""
+        return ( self.size[0] // self.basis[0], self.size[1] // self.basis[1] )
+
+    def resize(self, size) -> None:
+        """Set the buffer size in glyxels, rounded up to whole cells, and clear it"""
+        dx, dy = self.basis
+        cols, rows = -(-size[0] // dx), -(-size[1] // dy)
+        self.size = ( cols * dx, rows * dy )
+        self.pixels = bytearray( self.background * ( self.size[0] * self.size[1] ) )
+        self._segments = [ [None] * cols for _ in range( rows ) ]
+        self._strips = [ Strip.blank( cols ) for _ in range( rows ) ]
+        self._dirty = { row: set( range( cols ) ) for row in range( rows ) }
+
+    def clear(self, color=None) -> None:
+        """Fill the buffer with a color, the background by default"""
+        if color is not None:
+            self.background = self.rgb( color )
+        self.pixels[:] = self.background * ( self.size[0] * self.size[1] )
+        self._touch( 0, 0, self.size[0], self.size[1] )
+
+    def get_pixel(self, x: int, y: int) -> tuple:
+        offset = 3 * ( y * self.size[0] + x )
+        return tuple( self.pixels[ offset:offset + 3 ] )
+
+    def set_pixel(self, x: int, y: int, color) -> None:
+        self.set_pixels( ((x, y),), color )
+
+    def set_pixels(self, points, color) -> None:
+        """Set every glyxel (x, y) of points inside the buffer to one color"""
+        rgb = self.rgb( color )
+        width, height = self.size
+        dx, dy = self.basis
+        pixels, dirty = self.pixels, self._dirty
+        for x, y in points:
+            if 0 <= x < width and 0 <= y < height:
+                offset = 3 * ( y * width + x )
+                pixels[ offset:offset + 3 ] = rgb
+                dirty.setdefault( y // dy, set() ).add( x // dx )
+
+    def line(self, x0: int, y0: int, x1: int, y1: int, color) -> None:
+        """A Bresenham line between glyxels (x0, y0) and (x1, y1), both ends included"""
+        points = []
+        step_x, step_y = ( 1 if x1 >= x0 else -1 ), ( 1 if y1 >= y0 else -1 )
+        delta_x, delta_y = abs( x1 - x0 ), -abs( y1 - y0 )
+        error = delta_x + delta_y
+        while True:
+            points.append( (x0, y0) )
+            if x0 == x1 and y0 == y1:
+                break
+            twice = 2 * error
+            if twice >= delta_y:
+                error += delta_y
+                x0 += step_x
+            if twice <= delta_x:
+                error += delta_x
+                y0 += step_y
+        self.set_pixels( points, color )
+
+    def rect(self, x: int, y: int, width: int, height: int, color, fill: bool = True) -> None:
+        """A rectangle at glyxel (x, y) of width by height glyxels, filled or outlined"""
+        if not fill:
+            x1, y1 = x + width - 1, y + height - 1
+            self.rect( x, y, width, 1, color )
+            self.rect( x, y1, width, 1, color )
+            self.rect( x, y, 1, height, color )
+            self.rect( x1, y, 1, height, color )
+            return
+        x0, y0 = max( x, 0 ), max( y, 0 )
+        x1, y1 = min( x + width, self.size[0] ), min( y + height, self.size[1] )
+        if x1 <= x0 or y1 <= y0:
+            return
+        run = self.rgb( color ) * ( x1 - x0 )
+        stride = 3 * self.size[0]
+        for row in range( y0, y1 ):
+            offset = row * stride + 3 * x0
+            self.pixels[ offset:offset + len( run ) ] = run
+        self._touch( x0, y0, x1, y1 )
+
+    def blit(self, x: int, y: int, source) -> None:
+        """Copy a PIL image, or rows of colors, to glyxel (x, y); image alpha is composited"""
+        if hasattr( source, "mode" ):
+            width, height = source.size
+            if "A" in source.getbands() or "transparency" in source.info:
+                source = source.convert("RGBA")
+                under = self.image().crop( (x, y, x + width, y + height) ).convert("RGBA")
+                under.alpha_composite( source )
+                source = under
+            data = source.convert("RGB").tobytes()
+            rows = [ data[ 3 * width * row:3 * width * (row + 1) ] for row in range( height ) ]
+        else:
+            rows = [ b"".join( self.rgb( color ) for color in row ) for row in source ]
+        stride = 3 * self.size[0]
+        x0, x1 = max( x, 0 ), self.size[0]
+        touched = False
+        for row_idx, row in enumerate( rows ):
+            y_pos = y + row_idx
+            if not 0 <= y_pos < self.size[1]:
+                continue
+            run = row[ 3 * ( x0 - x ):3 * ( x1 - x ) ]
+            if run:
+                offset = y_pos * stride + 3 * x0
+                self.pixels[ offset:offset + len( run ) ] = run
+                touched = True
+        if touched:
+            width = max( len( row ) for row in rows ) // 3
+            self._touch( x0, max( y, 0 ), min( x + width, x1 ), min( y + len( rows ), self.size[1] ) )
+
+    def image(self):
+        """The buffer as a PIL RGB image"""
+        from PIL import Image
+
+        return Image.frombytes( "RGB", self.size, bytes( self.pixels ) )
+
+    def _touch(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """Mark the cells under glyxels [x0, x1) by [y0, y1) for encoding"""
+        dx, dy = self.basis
+        cols = range( x0 // dx, -(-x1 // dx) )
+        for row in range( y0 // dy, -(-y1 // dy) ):
+            self._dirty.setdefault( row, set() ).update( cols )
+
+    def dirty_rows(self) -> list:
+        return sorted( self._dirty )
+
+    def slate(self) -> list:
+        """The buffer as a slate, encoding only the dirty cells"""
+        if self._dirty:
+            self._encode()
+        return self._strips
+
+    def _encode(self) -> None:
+        dx, dy = self.basis
+        stride = 3 * self.size[0]
+        run = 3 * dx
+        pixels = self.pixels
+        cache = self._cell_cache.setdefault( self._cells_key, {} )
+        dirty, self._dirty = self._dirty, {}
+        for row, cols in dirty.items():
+            segments = self._segments[ row ]
+            top = row * dy * stride
+            for col in cols:
+                offset = top + col * run
+                key = b"".join( pixels[ offset + line * stride:offset + line * stride + run ] for line in range( dy ) )
+                segment = cache.get( key )
+                if segment is None:
+                    if len( cache ) >= self.cell_cache_max:
+                        cache.clear()
+                    segment = cache[ key ] = self._cell2segment( key )
+                segments[ col ] = segment
+            self._strips[ row ] = Strip( segments, len( segments ) )
+
+    def _cell2segment(self, cell: bytes) -> Segment:
+        """Split a cell's glyxels into the brighter (glyph) and darker (background) colors"""
+        colors = [ tuple( cell[ idx:idx + 3 ] ) for idx in range( 0, len( cell ), 3 ) ]
+        first = colors[0]
+        if colors.count( first ) == len( colors ):
+            glut_idx, on = 0, []
+        else:
+            lums = [ 299 * red + 587 * green + 114 * blue for red, green, blue in colors ]
+            mean = sum( lums ) / len( lums )
+            on = [ lum > mean for lum in lums ]
+            if not any( on ):
+                on = [ color != first for color in colors ]
+            glut_idx = sum( 1 << idx for idx, bit in enumerate( on ) if bit )
+        fg = [ color for color, bit in zip( colors, on ) if bit ]
+        bg = [ color for idx, color in enumerate( colors ) if not ( glut_idx >> idx ) & 1 ]
+        glyph_sty = Style( color=ToGlyxels._colors2rgb4sty( fg ), bgcolor=ToGlyxels._colors2rgb4sty( bg ) )
+        return Segment( self._glyphs[ glut_idx ], glyph_sty )
+
+
+class EnGlyphCanvas( EnGlyph ):
+    """A Textual widget to draw upon directly at glyxel resolution.
+        Drawing only encodes the cells touched again and refreshes only their lines.
+        Args:
+            size (tuple int,int): Canvas width and height in glyxels, rounded up to whole cells.
+            background (color): (r, g, b), 0xRRGGBB or Rich color name the canvas starts as.
+            basis (tuple int,int): Glyph pixel (glyxel) partitions in x then y.
+            pips (Bool): Are glyxels partition filling or not.
+            Standard Textual Widget Args.
+
+        Returns:
+            Textual Widget Instance.
+    """
+
+    def __init__(self, *args, size=(80, 48), background=(0, 0, 0), **kwargs):
+        self._size_glyxels = size
+        self._background = background
+        super().__init__(None, *args, **kwargs)
+
+    def _preprocess(self, renderable=None, *args, **kwargs):
+        self.canvas = GlyxelBuffer( self._size_glyxels, self._basis, self._pips, self._background )
+        return renderable
+
+    def _process(self) -> None:
+        pass
+
+    def resize(self, size) -> None:
+        self.canvas.resize( size )
+        self.refresh( layout=True )
+
+    def clear(self, color=None) -> None:
+        self.canvas.clear( color )
+        self._changed()
+
+    def set_pixel(self, x: int, y: int, color) -> None:
+        self.canvas.set_pixel( x, y, color )
+        self._changed()
+
+    def set_pixels(self, points, color) -> None:
+        self.canvas.set_pixels( points, color )
+        self._changed()
+
+    def line(self, x0: int, y0: int, x1: int, y1: int, color) -> None:
+        self.canvas.line( x0, y0, x1, y1, color )
+        self._changed()
+
+    def rect(self, x: int, y: int, width: int, height: int, color, fill: bool = True) -> None:
+        self.canvas.rect( x, y, width, height, color, fill )
+        self._changed()
+
+    def blit(self, x: int, y: int, source) -> None:
+        self.canvas.blit( x, y, source )
+        self._changed()
+
+    def _changed(self) -> None:
+        cols = self.canvas.cells[0]
+        self.refresh( *[ Region( 0, row, cols, 1 ) for row in self.canvas.dirty_rows() ] )
+
+    def get_content_width(self, container=None, viewport=None):
+        return self.canvas.cells[0]
+
+    def get_content_height(self, container=None, viewport=None, width=None):
+        return self.canvas.cells[1]
+
+    def render_line(self, y: int) -> Strip:
+        slate = self.canvas.slate()
+        if y < len( slate ):
+            return slate[y]
+        return Strip.blank( 0 )
+
+    def __str__(self) -> str:
+        return "\n".join( [strip.text for strip in self.canvas.slate()] )
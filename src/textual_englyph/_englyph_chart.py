@@ -0,0 +1,204 @@
+"""Stream time series as braille or sextant glyxels for Textual with custom widget EnGlyph"""
+from collections import deque
+
+from rich.segment import Segment
+from rich.style import Style
+
+from textual.strip import Strip
+
+from .englyph import EnGlyph
+from .toglyxels import ToGlyxels
+
+
+class EnGlyphChart( EnGlyph ):
+    """A Textual widget plotting streamed samples, one glyxel column per sample, newest at the right.
+        A sample only encodes the newest cell column. When that column fills, earlier columns
+        shift left without being encoded again, so the cost per sample does not grow with width.
+        Autoscaling encodes every column again, but only when the scale changes.
+        Args:
+            size (tuple int,int): Chart width and height in cells.
+            series (tuple color): Rich color of each series, earlier series draw over later ones.
+            scale (tuple float,float): Fixed (bottom, top) values, or None to autoscale.
+            line (Bool): Join each sample to the one before, or plot points only.
+            basis (tuple int,int): (2,4) with pips is braille, (2,3) without pips is sextants.
+            pips (Bool): Are glyxels partition filling or not.
+            Standard Textual Widget Args.
+
+        Returns:
+            Textual Widget Instance.
+    """
+
+    def __init__(
+        self,
+        *args,
+        size: tuple = (40, 8),
+        series: tuple = ("green",),
+        scale: tuple|None = None,
+        line: bool = True,
+        **kwargs
+    ):
+        kwargs.setdefault( "pips", True )
+        self._chart_size = size
+        self._series_styles = [ Style( color=color ) for color in series ]
+        self._fixed_scale = scale
+        self._line = line
+        super().__init__(None, *args, **kwargs)
+
+    def _preprocess(self, renderable=None, *args, **kwargs):
+        glut = ToGlyxels.pips_glut if self._pips else ToGlyxels.full_glut
+        self._glyphs = glut[ self._basis[0] ][ self._basis[1] ]
+        self._segments = {} # (glut index, series) -> Segment
+        self._blank = Segment( self._glyphs[0] )
+        self.clear()
+        return renderable
+
+    def _process(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        """Drop every sample"""
+        cols, rows = self._chart_size
+        # a column more than shown, so the leftmost column keeps the sample its line starts at
+        self._samples = deque( maxlen=( cols + 1 ) * self._basis[0] )
+        self._count = 0 # samples ever pushed, the absolute index of the next
+        # sliding window extremes as (index, value), monotonic so each sample is handled once
+        self._lows = deque()
+        self._highs = deque()
+        self._bottom, self._top = self._fixed_scale or ( 0.0, 1.0 )
+        self._grid = [ deque( maxlen=cols - 1 ) for _ in range( rows ) ]
+        self._column = [ self._blank ] * rows
+        self._strips = None
+        self.rescales = 0
+        self.refresh()
+
+    def push(self, *values) -> None:
+        """Add one sample, a value (or None for a gap) per series"""
+        self._push( values )
+        self.refresh()
+
+    def extend(self, samples) -> None:
+        """Add many samples, each a sequence of values per series, and refresh once"""
+        for values in samples:
+            self._push( tuple( values ) )
+        self.refresh()
+
+    def _push(self, values) -> None:
+        dx = self._basis[0]
+        index = self._count
+        if index % dx == 0 and index:
+            # the newest column is full, it shifts left as is
+            for row, segment in zip( self._grid, self._column ):
+                row.append( segment )
+        self._samples.append( values )
+        self._count += 1
+        self._strips = None
+        if self._fixed_scale is None and self._autoscale( index, values ):
+            self._encode_all()
+            return
+        self._column = self._encode_column( index )
+
+    def _autoscale(self, index: int, values) -> bool:
+        """Track the window extremes, is a new scale needed"""
+        oldest = index - self._samples.maxlen
+        present = [ value for value in values if value is not None ]
+        if present:
+            low, high = min( present ), max( present )
+            while self._lows and self._lows[-1][1] >= low:
+                self._lows.pop()
+            self._lows.append( (index, low) )
+            while self._highs and self._highs[-1][1] <= high:
+                self._highs.pop()
+            self._highs.append( (index, high) )
+        while self._lows and self._lows[0][0] <= oldest:
+            self._lows.popleft()
+        while self._highs and self._highs[0][0] <= oldest:
+            self._highs.popleft()
+        if not self._lows:
+            return False
+        low, high = self._lows[0][1], self._highs[0][1]
+        headroom = ( high - low ) / 8 or 0.5
+        fitted = high - low + 2 * headroom
+        # grow at once with headroom, shrink only when the fitted scale is under half of it
+        if low < self._bottom or high > self._top or fitted * 2 < self._top - self._bottom:
+            self._bottom, self._top = low - headroom, high + headroom
+            self.rescales += 1
+            return True
+        return False
+
+    def _encode_all(self) -> None:
+        """Encode every column again, after a scale change"""
+        dx = self._basis[0]
+        for row in self._grid:
+            row.clear()
+        first = self._count - len( self._samples )
+        last = self._count - 1
+        for column in range( first // dx, last // dx ):
+            for row, segment in zip( self._grid, self._encode_column( column * dx ) ):
+                row.append( segment )
+        self._column = self._encode_column( last )
+
+    def _encode_column(self, index: int) -> list:
+        """The segment of each row for the cell column holding sample index"""
+        dx, dy = self._basis
+        first = self._count - len( self._samples )
+        start = index - index % dx
+        height = len( self._grid ) * dy
+        rows = {} # row -> [glut index, top series]
+        prev = self._samples[ start - 1 - first ] if start > first else None
+        for x_pos in range( dx ):
+            idx = start + x_pos
+            if idx < first or idx >= self._count:
+                continue
+            sample = self._samples[ idx - first ]
+            for series, value in enumerate( sample ):
+                if value is None:
+                    continue
+                y_lo = y_hi = self._y( value, height )
+                if self._line and prev is not None and series < len( prev ) and prev[ series ] is not None:
+                    y_prev = self._y( prev[ series ], height )
+                    y_lo, y_hi = min( y_lo, y_prev ), max( y_hi, y_prev )
+                for y_pos in range( y_lo, y_hi + 1 ):
+                    cell = rows.setdefault( y_pos // dy, [0, series] )
+                    cell[0] |= 1 << ( ( y_pos % dy ) * dx + x_pos )
+                    cell[1] = min( cell[1], series )
+            prev = sample
+        column = [ self._blank ] * len( self._grid )
+        for row, key in rows.items():
+            key = tuple( key )
+            segment = self._segments.get( key )
+            if segment is None:
+                style = self._series_styles[ key[1] % len( self._series_styles ) ]
+                segment = self._segments[ key ] = Segment( self._glyphs[ key[0] ], style )
+            column[ row ] = segment
+        return column
+
+    def _y(self, value: float, height: int) -> int:
+        """Glyxel row of a value, the top is row 0"""
+        span = self._top - self._bottom
+        y_pos = round( ( self._top - value ) / span * ( height - 1 ) ) if span else height - 1
+        return min( max( y_pos, 0 ), height - 1 )
+
+    @property
+    def scale(self) -> tuple:
+        """The (bottom, top) values of the chart"""
+        return ( self._bottom, self._top )
+
+    def get_content_width(self, container=None, viewport=None):
+        return self._chart_size[0]
+
+    def get_content_height(self, container=None, viewport=None, width=None):
+        return self._chart_size[1]
+
+    def render_line(self, y: int) -> Strip:
+        if self._strips is None:
+            cols = self._chart_size[0]
+            self._strips = []
+            for row, segment in zip( self._grid, self._column ):
+                pad = [ self._blank ] * ( cols - 1 - len( row ) )
+                self._strips.append( Strip( pad + list( row ) + [ segment ], cols ) )
+        if y < len( self._strips ):
+            return self._strips[y]
+        return Strip.blank( 0 )
+
+    def __str__(self) -> str:
+        return "\n".join( [ self.render_line( y ).text for y in range( self._chart_size[1] ) ] )
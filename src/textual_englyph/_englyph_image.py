@@ -1,11 +1,17 @@
 """Create large text output module for Textual with custom widget EnGlyph"""
 
+import os
+from collections import OrderedDict
 from contextlib import suppress
-from PIL import ImageOps
+from threading import Lock
+from time import perf_counter
+from weakref import WeakValueDictionary, ref
 
-from textual import work
+from textual.worker import get_current_worker
+from textual.geometry import Region
+from textual.strip import Strip
 
-from .englyph import EnGlyph
+from .englyph import EnGlyph, EnFrames, EnPipe, AdaptiveQuality, asset_loader
 from .toglyxels import ToGlyxels, EnLoad
 
 
@@ -16,6 +22,12 @@ class EnGlyphImage(EnGlyph):
             basis (tuple int,int): Glyph pixel (glyxel) partitions in x then y.
             pips (Bool): Are glyxels partition filling or not.
             repeat (int): Number of times an animated image loops.
+            tiled (Bool): Convert only the cell tiles scrolled into view, still images only.
+            tile_size (tuple int,int): Tile width and height in cells.
+            tile_cache (int): Most converted tiles kept, least recently shown are dropped.
+            adaptive (Bool | AdaptiveQuality): Degrade animation quality under load, True for the default ladder.
+            async_load (Bool): Decode and convert on the asset loader after mount, showing a placeholder.
+            placeholder (tuple int,int): Placeholder width and height in cells, unless CSS sizes it.
             Standard Textual Widget Args.
             
         Returns:
@@ -25,13 +37,56 @@ class EnGlyphImage(EnGlyph):
     DEFAULT_CSS = """
     EnGlyphImage {
         max-height: 32;
+        &.-tiled {
+            max-height: initial;
+        }
     }
     """
 
-    def __init__(self, *args, repeat: int = 3, **kwargs):
+    # decoded image files by (path, mtime, size), frame stores by source and conversion
+    _sources = WeakValueDictionary()
+    _stores = WeakValueDictionary()
+    # seeking and decoding a shared source is serialized between widgets and workers
+    _source_lock = Lock()
+
+    def __init__(
+        self,
+        *args,
+        repeat: int = 3,
+        tiled: bool = False,
+        tile_size: tuple = (32, 8),
+        tile_cache: int = 256,
+        adaptive: bool|AdaptiveQuality = False,
+        async_load: bool = False,
+        placeholder: tuple = (16, 8),
+        **kwargs
+    ):
         self.animate = 0
-        self._repeats_n = repeat
+        self._async_load = async_load
+        self._placeholder = placeholder
+        self._load_pending = None
+        self._load_gen = 0
+        self._load_start = None
+        self.load_latency = None # seconds from construction, or update, until the image shows
+        self.load_error = None # the exception of a failed async_load, the placeholder stays
+        self._quality = AdaptiveQuality() if adaptive is True else ( adaptive or None )
+        self._quality_reinit = False
+        self._quality_pending = None # the pipe of a new quality level, until its store is complete
+        self._color_bits = 8
+        self._frame_stride = 1
+        self._animate_tick = 0
+        self._paused = False
+        self._repeats_n = 0 if tiled else repeat
+        self._tiled = tiled
+        self._tile_size = tile_size
+        self._tile_cache = tile_cache
+        self._tiles = OrderedDict()
+        self._tile_img = None
+        self._tile_cells = (0, 0)
         super().__init__(*args, **kwargs)
+        self._full_quality = ( self._basis, self._pips )
+        if tiled:
+            self.add_class("-tiled")
 
     def pipeline_show(self, index:int = 1 ) -> None:
         self._slate_pipe.show( index )
@@ -43,13 +98,74 @@ class EnGlyphImage(EnGlyph):
 
     def enable_animate(self):
         if self.animate != 0:
+            self._animate_left = self._repeats_n * self._frames_n - 1
+            self._paused = False
+            if self._quality is not None:
+                self._quality.restart()
             self.animate_timer.reset()
             self.animate_timer.resume()
 
+    def disable_animate(self):
+        if self.animate != 0:
+            self._paused = True
+            self.animate_timer.pause()
+
+    def _animate_step(self) -> None:
+        self._animate_left -= 1
+        if self._animate_left <= 0:
+            self._paused = True
+        # a lower frame rate skips ticks, then catches up the frames skipped
+        self._animate_tick += 1
+        if self._animate_tick % self._frame_stride and not self._paused:
+            return
+        self.pipeline_advance( self._frame_stride )
+        if self._quality is not None:
+            decide = self._quality_pending is None and self._slate_pipe.slates.complete
+            if self._quality.frame( decide=decide ):
+                self._quality_apply()
+
+    def _quality_apply(self) -> None:
+        """Convert the frames again at the options of the current quality level"""
+        options = self._quality.options()
+        self._frame_stride = max( 1, round( 1 / options.get( "fps", 1 ) ) )
+        conversion = (
+            options.get( "basis", self._full_quality[0] ),
+            options.get( "pips", self._full_quality[1] ),
+            options.get( "color_bits", 8 ),
+        )
+        if conversion == ( self._basis, self._pips, self._color_bits ):
+            return
+        self._basis, self._pips, self._color_bits = conversion
+        shown = self._slate_pipe
+        self._slate_pipe = EnPipe()
+        self._slate_pipe.owner = ref( self )
+        self._quality_reinit = True
+        self._pipeline_init()
+        if self._slate_pipe.slates.complete:
+            self._slate_pipe.show( shown.index )
+        else:
+            # the old frames keep playing until the new store is complete, see _frames_ready
+            self._quality_pending, self._slate_pipe = self._slate_pipe, shown
+        self.refresh(layout=True)
+
+    def _frames_in_use(self) -> bool:
+        """A paused or finished animation only needs its current frame"""
+        return not self._paused and super()._frames_in_use()
+
     def _preprocess(self, pil_img=None) -> None:
         """init handler to preset PIL image(renderable) properties for glyph processing"""
+        if pil_img is not None and self._async_load:
+            # decoded on the asset loader once mounted, a placeholder shows until then
+            self.renderable = None
+            self._load_pending = pil_img
+            self._load_gen += 1
+            self._load_start = perf_counter()
+            self.load_latency = None
+            self.load_error = None
+            self._frames_n = 1
+            return pil_img
         if pil_img is not None:
-            self.renderable = EnLoad( pil_img )
+            self.renderable = self._load_source( pil_img )
         self._frames_n = self._get_frame_count(self.renderable)
         #raise AttributeError( self._frames_n )
         #raise AttributeError( self._repeats_n )
@@ -58,46 +174,205 @@ class EnGlyphImage(EnGlyph):
             self._duration_s = self.renderable.info.get("duration", 100) / 1000
         return pil_img
 
-    def _process(self) -> None:
+    def _process(self, first=None) -> None:
         """An on_mount (DOM ready) handler for "image" glyph processing"""
-        self._pipeline_init()
+        if self._load_pending is not None:
+            self._load_placeholder()
+            self.call_after_refresh( self._load_submit )
+            return
+        if self._tiled:
+            self._tiles_init()
+            return
+        self._quality_reinit, self._quality_pending = False, None
         if self.animate != 0:
+            if self._quality is not None:
+                self._quality.target = self._duration_s
             max_frames = self._repeats_n * self._frames_n - 1
+            self._paused = True
             self.animate_timer = self.set_interval(
                 interval=self._duration_s,
-                callback=self.pipeline_advance,
+                callback=self._animate_step,
                 repeat=max_frames,
                 pause=True
             )
+        self._pipeline_init( first )
 
-    def _pipeline_init(self) -> None:
-        if isinstance( self.renderable, list ):
-            self.load_pipe( self.renderable[0], self._slate_pipe.this )
-        else:
-            self.load_pipe( self.renderable, self._slate_pipe.this )
-        if self._frames_n > 0:
-            self._pipeline_fill( self.renderable )
+    def _load_placeholder(self) -> None:
+        cols, rows = self._placeholder
+        with suppress(AttributeError):
+            cols = self.styles.width.cells or cols
+        with suppress(AttributeError):
+            rows = self.styles.height.cells or rows
+        self._slate = [ Strip.blank( cols ) for _ in range( rows ) ]
+        self.refresh(layout=True)
+
+    def _load_submit(self) -> None:
+        gen, source = self._load_gen, self._load_pending
+        if source is None:
+            return
+        box, stretch = self._rescale_box()
+        conversion = ( box, stretch, self._basis, self._pips, self._color_bits )
+        asset_loader.submit(
+            self,
+            lambda: self._load_job( source, conversion ),
+            lambda result: self._load_done( gen, conversion, result ),
+        )
+
+    def _load_job(self, source, conversion):
+        """Loader thread: decode the source and convert its first frame"""
+        img = self._load_source( source )
+        if self._tiled:
+            return img, None
+        return img, EnGlyphImage._frame2slate( img, 0, *conversion )
+
+    def _load_done(self, gen: int, conversion, result) -> None:
+        if gen != self._load_gen:
+            return
+        self._load_pending = None
+        if isinstance( result, Exception ):
+            # the placeholder stays, the error is kept and logged rather than raised on the event loop
+            self.load_error = result
+            self.log.error( f"EnGlyphImage load failed: {result!r}" )
+            return
+        img, first = result
+        self.renderable = img
+        self._preprocess()
+        if conversion != ( *self._rescale_box(), self._basis, self._pips, self._color_bits ):
+            first = None
+        self._process( first )
+        self.load_latency = perf_counter() - self._load_start
+        self.refresh(layout=True)
+
+    def _load_source(self, maybe_paths):
+        """EnLoad image files once for every widget showing the same unchanged file"""
+        if isinstance( maybe_paths, list ):
+            return [ self._load_source( path ) for path in maybe_paths ]
+        if not isinstance( maybe_paths, str ):
+            return maybe_paths
+        stat = os.stat( maybe_paths )
+        key = ( os.path.realpath( maybe_paths ), stat.st_mtime_ns, stat.st_size )
+        with self._source_lock:
+            img = self._sources.get( key )
+            if img is None:
+                img = EnLoad( maybe_paths )
+                img.englyph_key = key
+                img.englyph_frames = self._get_frame_count( img )
+                self._sources[ key ] = img
+        return img
 
-    @work(exclusive=True, thread=True )
-    def _pipeline_fill(self, renderable) -> None:
-        for idx in range( 1, self._frames_n ):
-            if isinstance( renderable, list ):
-                self.load_pipe( renderable[ idx ], self._slate_pipe.append )
+    def _source_key(self, img):
+        if isinstance( img, list ):
+            return tuple( self._source_key( item ) for item in img )
+        return getattr( img, "englyph_key", ( "id", id( img ) ) )
+
+    def _pipeline_init(self, first=None) -> None:
+        box, stretch = self._rescale_box()
+        key = ( self._source_key( self.renderable ), box, stretch, self._basis, self._pips, self._color_bits )
+        frames = self._stores.get( key )
+        if frames is not None:
+            # same source and conversion: share the frames, keep our own playback
+            self._slate_pipe.share( frames )
+            if frames.complete:
+                self._frames_ready()
             else:
-                renderable.seek( idx )
-                self.load_pipe( renderable, self._slate_pipe.append )
-        if self._repeats_n > 0:
+                frames.waiters.append( self._frames_ready )
+            self.refresh(layout=True)
+            return
+        # a new store, the one shown until now may be shared with other widgets
+        frames = EnFrames()
+        self._slate_pipe.share( frames )
+        self._stores[ key ] = frames
+        # evicted frames are converted again from the retained source
+        renderable, basis, pips, bits = self.renderable, self._basis, self._pips, self._color_bits
+        frames.source = lambda index: EnGlyphImage._frame2slate( renderable, index, box, stretch, basis, pips, bits )
+        if self._quality is not None:
+            frames.source = self._quality.timed( frames.source )
+        frames.waiters.append( self._frames_ready )
+        self._slate_pipe.this( frames.source( 0 ) if first is None else first )
+        if self._frames_n > 0:
+            self._pipeline_fill( key, frames )
+
+    def _pipeline_fill(self, key, frames) -> None:
+        """Fill the store on an app worker, so it outlives the widget that created it"""
+        app, count = self.app, self._frames_n
+        app.run_worker(
+            lambda: EnGlyphImage._store_fill( app, key, frames, count ),
+            group="englyph-store",
+            thread=True,
+        )
+
+    @staticmethod
+    def _store_fill(app, key, frames, count: int) -> None:
+        worker = get_current_worker()
+        for idx in range( len( frames ), count ):
+            if worker.is_cancelled or not frames.attached():
+                # no widget shows the store any more, an incomplete store is never shared again
+                if EnGlyphImage._stores.get( key ) is frames:
+                    del EnGlyphImage._stores[ key ]
+                return
+            frames.put( idx, frames.source( idx ) )
+        frames.complete = True
+        app.call_from_thread( EnGlyphImage._frames_complete, frames )
+
+    @staticmethod
+    def _frames_complete(frames) -> None:
+        waiters, frames.waiters = frames.waiters, []
+        for waiter in waiters:
+            waiter()
+
+    def _frames_ready(self) -> None:
+        if self._quality_reinit:
+            # frames at a new quality level, swapped in where the animation has got to
+            self._quality_reinit = False
+            pending, self._quality_pending = self._quality_pending, None
+            if pending is not None:
+                pending.show( self._slate_pipe.index )
+                self._slate_pipe = pending
+                self.refresh(layout=True)
+            self._quality.restart()
+            return
+        if self._repeats_n > 0 and self.is_mounted:
             self.enable_animate()
 
+    @staticmethod
+    def _frame2slate(source, index: int, box, stretch: bool, basis, pips, color_bits: int = 8):
+        """Convert a frame of the source image(s) into the rescale box, at color_bits per channel"""
+        from PIL import ImageOps
+
+        with EnGlyphImage._source_lock:
+            if isinstance( source, list ):
+                img = source[ index ].convert("RGB")
+            else:
+                source.seek( index )
+                img = source.convert("RGB")
+        frame = img.resize( box ) if stretch else ImageOps.contain( img, box )
+        if color_bits < 8:
+            mask = 0xFF << ( 8 - color_bits ) & 0xFF
+            frame = frame.point( lambda value: value & mask )
+        return ToGlyxels.image2slate( frame, basis=basis, pips=pips )
+
     def load_pipe(self, img, pipe ):
-        #raise AttributeError( self._repeats_n )
-        frame = self._rescale_img(img.convert("RGB"))
+        with self._source_lock:
+            img = img.convert("RGB")
+        frame = self._rescale_img( img )
         slate = ToGlyxels.image2slate( frame, basis=self._basis, pips=self._pips)
         pipe( slate )
 
     def _rescale_img(self, img) -> None:
         """Contain the image within CSS height or width keeping aspect ratio or fit image if both
         if max-height or max-width is specified the crop the image to the max dimension."""
+        from PIL import ImageOps
+
+        im_size, stretch = self._rescale_box()
+        if stretch:
+            im_data = img.resize( im_size )
+        else:
+            im_data = ImageOps.contain(img, im_size)
+
+        return im_data
+
+    def _rescale_box(self):
+        """The glyxel box to rescale into from CSS sizes, and whether to stretch into it"""
         use_width = use_height = False
         cell_width = cell_height = 1
 
@@ -119,16 +394,106 @@ class EnGlyphImage(EnGlyph):
         cell_height = cell_height or self.parent.size.height
 
         im_size = (self._basis[0] * cell_width, self._basis[1] * cell_height)
-        if use_width and use_height:
-            im_data = img.resize( im_size )
+        return im_size, use_width and use_height
+
+    def _tiles_init(self) -> None:
+        """Keep the source for lazy tile conversion, glyxels are image pixels unless CSS sizes it"""
+        img = self.renderable[0] if isinstance( self.renderable, list ) else self.renderable
+        img = img.convert("RGB")
+        with suppress(AttributeError):
+            if self.styles.width.cells is not None or self.styles.height.cells is not None:
+                img = self._rescale_img( img )
+        self._tile_img = img
+        self._tiles.clear()
+        dx, dy = self._basis
+        self._tile_cells = ( -(-img.width // dx), -(-img.height // dy) )
+        self.refresh(layout=True)
+
+    def _tile(self, tx: int, ty: int) -> list:
+        """The slate of a tile, converted on first use"""
+        slate = self._tiles.get( (tx, ty) )
+        if slate is None:
+            tw, th = self._tile_size
+            dx, dy = self._basis
+            box = (
+                tx * tw * dx, ty * th * dy,
+                min( (tx + 1) * tw * dx, self._tile_img.width ),
+                min( (ty + 1) * th * dy, self._tile_img.height ),
+            )
+            slate = ToGlyxels.image2slate( self._tile_img.crop( box ), basis=self._basis, pips=self._pips )
+            self._tiles[ (tx, ty) ] = slate
         else:
-            im_data = ImageOps.contain(img, im_size)
+            self._tiles.move_to_end( (tx, ty) )
+        return slate
 
-        return im_data
+    def render_lines(self, crop: Region) -> list:
+        if self._tiled and self._tile_img is not None:
+            self._tiles_show( crop )
+        if self._quality is None:
+            return super().render_lines( crop )
+        start = perf_counter()
+        lines = super().render_lines( crop )
+        self._quality.rendered( perf_counter() - start )
+        return lines
+
+    def _tiles_show(self, crop: Region) -> None:
+        """Convert the tiles under the visible crop, evicting the least recently shown"""
+        gutter = self.styles.gutter
+        tw, th = self._tile_size
+        x_cells, y_cells = self._tile_cells
+        x0 = max( crop.x - gutter.left, 0 )
+        y0 = max( crop.y - gutter.top, 0 )
+        x1 = min( crop.right - gutter.left, x_cells )
+        y1 = min( crop.bottom - gutter.top, y_cells )
+        if x1 <= x0 or y1 <= y0:
+            return
+        shown = [
+            (tx, ty)
+            for ty in range( y0 // th, (y1 - 1) // th + 1 )
+            for tx in range( x0 // tw, (x1 - 1) // tw + 1 )
+        ]
+        fresh = [ tile for tile in shown if tile not in self._tiles ]
+        for tile in shown:
+            self._tile( *tile )
+        while len( self._tiles ) > max( self._tile_cache, len( shown ) ):
+            self._tiles.popitem( last=False )
+        if fresh:
+            # lines cached with placeholder tiles must be rendered again
+            self._styles_cache.set_dirty( crop )
+
+    def render_line(self, y: int) -> Strip:
+        if not self._tiled:
+            return super().render_line( y )
+        self._postprocess()
+        x_cells, y_cells = self._tile_cells
+        if self._tile_img is None or y >= y_cells:
+            return Strip.blank(0)
+        tw, th = self._tile_size
+        ty, line = divmod( y, th )
+        strips = []
+        for tx in range( 0, -(-x_cells // tw) ):
+            slate = self._tiles.get( (tx, ty) )
+            if slate is None:
+                strips.append( Strip.blank( min( tw, x_cells - tx * tw ) ) )
+            else:
+                strips.append( slate[ line ] )
+        return Strip.join( strips )
+
+    def get_content_width(self, container=None, viewport=None):
+        if self._tiled:
+            return self._tile_cells[0]
+        return super().get_content_width( container, viewport )
+
+    def get_content_height(self, container=None, viewport=None, width=None):
+        if self._tiled:
+            return self._tile_cells[1]
+        return super().get_content_height( container, viewport, width )
 
     def _get_frame_count(self, images):
         if isinstance( images, list ):
             return len( images )
+        if hasattr( images, "englyph_frames" ):
+            return images.englyph_frames
         frames_n = 0
         try:
             images.seek(0)
@@ -0,0 +1,89 @@
+"""Composite images and sprites onto one glyxel canvas for Textual with custom widget EnGlyph"""
+
+from textual.strip import Strip
+
+from .englyph import EnGlyph, PaneManagement
+from .toglyxels import EnLoad
+
+
+class EnGlyphPane(EnGlyph):
+    """A Textual widget projecting subscribed images and sprites, with alpha, onto one glyxel canvas.
+        Only the cells under sources that changed are encoded again, and the canvas renders as one slate.
+        Args:
+            basis (tuple int,int): Glyph pixel (glyxel) partitions in x then y.
+            pips (Bool): Are glyxels partition filling or not.
+            draggable (Bool): Can subscribed sources be dragged with the mouse.
+            Standard Textual Widget Args.
+
+        Returns:
+            Textual Widget Instance.
+    """
+
+    DEFAULT_CSS = """
+    EnGlyphPane {
+        width: 1fr;
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(None, *args, **kwargs)
+        self.view_pane = PaneManagement(basis=self._basis, pips=self._pips)
+        self._drag_key = None
+
+    def _preprocess(self, renderable=None, *args, **kwargs):
+        return renderable
+
+    def on_resize(self, event) -> None:
+        dx, dy = self._basis
+        background = self.styles.background
+        if background.a:
+            self.view_pane.background = background.rgb
+        self.view_pane.resize((event.size.width * dx, event.size.height * dy))
+        self.refresh()
+
+    def subscribe(self, key, image, points=(0, 0), z: int = 0) -> None:
+        """Project a PIL image (or path to) at glyxel points (x, y), higher z on top"""
+        self.view_pane.subscribe(key, EnLoad(image), points, z)
+        self.refresh()
+
+    def move(self, key, points=None, z: int|None = None, image=None) -> None:
+        """Change the position, z or image of a subscribed source"""
+        self.view_pane.update(key, image=None if image is None else EnLoad(image), points=points, z=z)
+        self.refresh()
+
+    def unsubscribe(self, key) -> None:
+        self.view_pane.unsubscribe(key)
+        self.refresh()
+
+    def get_content_width(self, container=None, viewport=None):
+        return self.view_pane.size[0] // self._basis[0]
+
+    def get_content_height(self, container=None, viewport=None, width=None):
+        return self.view_pane.size[1] // self._basis[1]
+
+    def on_mouse_down(self, event) -> None:
+        if self._draggable:
+            dx, dy = self._basis
+            self._drag_key = self.view_pane.source_at(event.x * dx, event.y * dy)
+            if self._drag_key is not None:
+                self.capture_mouse()
+
+    def on_mouse_move(self, event) -> None:
+        if self._drag_key is not None:
+            x, y = self.view_pane.points(self._drag_key)
+            points = (x + event.delta_x * self._basis[0], y + event.delta_y * self._basis[1])
+            if isinstance(self._drag_key, EnGlyph):
+                self._drag_key.pane_points = points + self._drag_key.pane_points[2:]
+            self.move(self._drag_key, points)
+
+    def on_mouse_up(self) -> None:
+        if self._drag_key is not None:
+            self._drag_key = None
+            self.release_mouse()
+
+    def render_line(self, y: int) -> Strip:
+        slate = self.view_pane.slate()
+        if y < len(slate):
+            return slate[y]
+        return Strip.blank(0)
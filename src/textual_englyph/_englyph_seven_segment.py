@@ -1,6 +1,10 @@
 """Create seven segment display output for Textual with custom widget EnGlyph"""
+from typing import Iterable, Tuple, Union
+
+from rich.console import Console
 
 from ._englyph_text import EnGlyphText
+from .toglyxels import ToGlyxels
 
 class EnSevSeg(EnGlyphText):
     """Seven Segement Display"""
@@ -13,6 +17,8 @@ class EnSevSeg(EnGlyphText):
     }
     """
     null_pinput = 0xED00 #Unicode PUA offset for pinput in EmSevSeg.ttf
+    # (font_name, font_size, basis, pips) -> unstyled glyph rows of all 256 segment masks
+    _pinput_tables = {}
 
     _config = {
         "smaller": (-2, "", (0, 0)), # for dynamic update of relative text_size
@@ -24,15 +30,108 @@ class EnSevSeg(EnGlyphText):
     def __init__(
         self,
         *args,
-        pinput: int|tuple|list|None = None,
+        pinput: int|tuple|list|bytes|None = None,
         text_size: str|None = "small",
         **kwargs,
     ):
+        if pinput is not None:
+            args = ( self._pinput2string( pinput ), ) + args[1:]
         super().__init__(
                 *args,
                 text_size=text_size,
                 **kwargs)
 
-    def _pinput2string( self, pinput ):
-        pass
+    def update( self, renderable=None, *args, pinput=None, **kwargs ) -> None:
+        """New display input, pinput sets segments directly: bits 0-6 are a-g, bit 7 DP"""
+        if pinput is not None:
+            renderable = self._pinput2string( pinput )
+        super().update( renderable, *args, **kwargs )
+
+    def _pinput2string( self, pinput: Union[int, tuple, list, bytes] ) -> str:
+        """Map segment masks, one per digit, to their PUA characters"""
+        if isinstance( pinput, int ):
+            pinput = [ pinput ]
+        for mask in pinput:
+            if not 0 <= mask <= 0xFF:
+                raise ValueError( f"pinput segment mask {mask} is not in range 0-255" )
+        return "".join( chr( self.null_pinput + mask ) for mask in pinput )
+
+    def _pinput_table( self ):
+        """Glyph rows for every segment mask, built once per font and basis"""
+        key = ( self._font_name, self._font_size, self._basis, self._pips )
+        table = self._pinput_tables.get( key )
+        if table is None:
+            # every mask in a fixed line height cell, so narrower glyphs tile too
+            panes = [
+                ToGlyxels.cell_pane( chr( self.null_pinput + mask ), self._font_name, self._font_size )
+                for mask in range( 256 )
+            ]
+            table = [
+                ToGlyxels._pane_rows( pane, self._basis, self._pips )
+                if pane[0] and pane[0] % self._basis[0] == 0 else None
+                for pane in panes
+            ]
+            self._pinput_tables[ key ] = table
+        return table
+
+    def _pinput_slate( self, phrase, style ):
+        """Tile precomputed segment mask slates, None if a mask is not in the table"""
+        if not self._font_name:
+            return None
+        masks = [ ord( char ) - self.null_pinput for char in phrase ]
+        if not masks or not all( 0 <= mask <= 0xFF for mask in masks ):
+            return None
+        table = self._pinput_table()
+        tiles = [ table[ mask ] for mask in masks ]
+        if None in tiles:
+            return None
+        return ToGlyxels.rows2slate( [ "".join( rows ) for rows in zip( *tiles ) ], style )
+
+    def chalking( self, renderable=None ):
+        """Render via digit glyph slates shared by every EnSevSeg"""
+        if self._basis == (0, 0):
+            return super().chalking( renderable )
+        if renderable is None:
+            renderable = self.renderable
+        slate_buf = []
+        for strip in Console().render_lines(renderable, pad=False):
+            for seg in strip:
+                slate = self._pinput_slate( seg.text, seg.style ) or ToGlyxels.phrase_slate(
+                    seg.text, seg.style,
+                    self._font_name or 'TerminusTTF-4.46.0.ttf', self._font_size,
+                    self._basis, self._pips
+                )
+                slate_buf = ToGlyxels.slate_join(slate_buf, slate)
+        return slate_buf
+
+    @classmethod
+    def batch_update( cls, updates: Iterable[Tuple["EnSevSeg", Union[str, int, tuple, list, bytes]]] ) -> int:
+        """
+        Render many (widget, value) pairs in one pass with one coalesced refresh.
+        A value is a string or, as for pinput, segment masks.
+        Unchanged values are skipped, a widget listed twice shows its last value.
+        Returns the number of widgets changed.
+        """
+        latest = dict( updates )
+        changed = []
+        for widget, value in latest.items():
+            if not isinstance( value, str ):
+                value = widget._pinput2string( value )
+            if value == widget._predicate:
+                continue
+            old_size = ( len(widget._slate), widget._slate[0].cell_length )
+            widget._predicate = value
+            widget._chalk_gen += 1 # supersede any async update in flight
+            widget.renderable = widget.marking( value )
+            if widget.is_mounted:
+                widget.renderable.stylize_before( widget.rich_style )
+            slate = widget.chalking()
+            widget._slate = slate
+            changed.append( (widget, old_size != (len(slate), slate[0].cell_length)) )
+        mounted = [ (widget, layout) for widget, layout in changed if widget.is_mounted ]
+        if mounted:
+            with mounted[0][0].app.batch_update():
+                for widget, layout in mounted:
+                    widget.refresh( layout=layout )
+        return len( changed )
 
@@ -1,8 +1,23 @@
+from textual import work
+
 from ._englyph_image import EnGlyphImage
 from .toglyxels import ToGlyxels, EnLoad
 
 class EnGlyphSprite( EnGlyphImage ):
-    def __init__(self, *args, draggable=True, **kwargs):
+    """A draggable EnGlyphImage with frames shown on demand.
+        Args:
+            renderable (PIL Image | path str | list): The frame images, or one sprite sheet.
+            frames (tuple int,int | dict | list): Sprite sheet layout, a (columns, rows) grid,
+                or a manifest of frame rectangles (x, y, width, height) as a list or a
+                dict keyed by frame name.
+            names (list str): Frame names for a grid sheet, in row major order.
+            Other EnGlyphImage Args.
+    """
+    def __init__(self, *args, draggable=True, frames=None, names=None, **kwargs):
+        self._atlas = frames
+        self._atlas_names = names
+        self._frame_names = {}
+        self._pane = None
         super().__init__(*args, draggable=draggable, repeat=0, **kwargs)
 
     def prior_frame( self ):
@@ -12,4 +27,107 @@ class EnGlyphSprite( EnGlyphImage ):
         self.pipeline_advance( 1 )
 
     def show_frame( self, index ):
+        """Show a frame by index or by name"""
+        if isinstance( index, str ):
+            index = self._frame_names[ index ]
         self.pipeline_show( index )
+
+    def pipeline_show(self, index:int = 1 ) -> None:
+        super().pipeline_show( index )
+        self._pane_update()
+
+    def pipeline_advance(self, frames:int = 1 ) -> None:
+        super().pipeline_advance( frames )
+        self._pane_update()
+
+    def project( self, pane, points=(0, 0), z: int = 0 ):
+        """Show this sprite, with alpha, as a source on an EnGlyphPane rather than as its own widget.
+            The frame shown follows prior_frame, next_frame, show_frame and animation."""
+        image = self._frame_rgba( self._slate_pipe.index )
+        self._pane = pane
+        self.pane_points = tuple( points[:2] ) + ( points[0] + image.width, points[1] + image.height )
+        pane.subscribe( self, image, points, z )
+        self.display = False
+
+    def _pane_update( self ):
+        if self._pane is not None:
+            image = self._frame_rgba( self._slate_pipe.index )
+            self._pane.move( self, image=image )
+
+    def _frame_rgba( self, index ):
+        """The rescaled frame as RGBA, alpha scaled by the CSS opacity"""
+        if self._atlas is not None:
+            x, y, width, height = self._atlas_rects[ index ]
+            with self._source_lock:
+                img = self.renderable.crop( (x, y, x + width, y + height) ).convert("RGBA")
+            img = img.resize( self._atlas_sizes[ index ] )
+        else:
+            with self._source_lock:
+                if isinstance( self.renderable, list ):
+                    img = self.renderable[ index ].convert("RGBA")
+                else:
+                    self.renderable.seek( index )
+                    img = self.renderable.convert("RGBA")
+            img = self._rescale_img( img )
+        opacity = self.styles.opacity
+        if opacity < 1:
+            img.putalpha( img.getchannel("A").point( lambda alpha: round( alpha * opacity ) ) )
+        return img
+
+    def _preprocess(self, pil_img=None) -> None:
+        if self._atlas is None:
+            return super()._preprocess( pil_img )
+        if pil_img is not None:
+            self.renderable = EnLoad( pil_img )
+        self._atlas_rects = self._atlas2rects( self._atlas, self.renderable.size )
+        names = self._atlas_names or []
+        if isinstance( self._atlas, dict ):
+            names = list( self._atlas )
+        self._frame_names = { name: idx for idx, name in enumerate( names ) }
+        self._frames_n = len( self._atlas_rects )
+        return pil_img
+
+    @staticmethod
+    def _atlas2rects( atlas, sheet_size ):
+        """Frame rectangles (x, y, width, height) of a grid or manifest layout"""
+        if isinstance( atlas, dict ):
+            return list( atlas.values() )
+        if isinstance( atlas, tuple ) and len( atlas ) == 2:
+            cols, rows = atlas
+            width, height = sheet_size[0] // cols, sheet_size[1] // rows
+            return [
+                (col * width, row * height, width, height)
+                for row in range( rows ) for col in range( cols )
+            ]
+        return list( atlas )
+
+    def _pipeline_init(self, first=None) -> None:
+        if self._atlas is None:
+            super()._pipeline_init( first )
+            return
+        from PIL import Image
+
+        # decode the sheet once, the first frame sets the scale
+        _, _, width, height = self._atlas_rects[0]
+        frame_w, frame_h = self._rescale_img( Image.new( "RGB", (width, height) ) ).size
+        x_scale, y_scale = frame_w / width, frame_h / height
+        with self._source_lock:
+            sheet = self.renderable.convert("RGB")
+        # each frame is cropped before resizing, so resampling never reaches into its neighbours
+        frames = [
+            ( (x, y, x + w, y + h), ( max( 1, round( w * x_scale ) ), max( 1, round( h * y_scale ) ) ) )
+            for x, y, w, h in self._atlas_rects
+        ]
+        self._atlas_sizes = [ size for _, size in frames ]
+        self._slate_pipe.source = lambda index: self._sheet2slate( sheet, *frames[ index ] )
+        self._slate_pipe.this( self._sheet2slate( sheet, *frames[0] ) )
+        if self._frames_n > 1:
+            self._atlas_fill( sheet, frames[1:] )
+
+    @work(exclusive=True, thread=True )
+    def _atlas_fill(self, sheet, frames) -> None:
+        for rect, size in frames:
+            self._slate_pipe.append( self._sheet2slate( sheet, rect, size ) )
+
+    def _sheet2slate(self, sheet, rect, size):
+        return ToGlyxels.image2slate( sheet.crop( rect ).resize( size ), basis=self._basis, pips=self._pips )
@@ -1,10 +1,13 @@
 """Create large text output module for Textual with custom widget EnGlyph"""
 from collections import deque, namedtuple
+from time import monotonic
 
 from rich.console import Console, RenderableType
 from rich.text import Text
 
+from textual import work
 from textual.strip import Strip
+from textual.worker import get_current_worker
 
 from .englyph import EnGlyph
 from .toglyxels import ToGlyxels
@@ -21,6 +24,13 @@ class EnGlyphText(EnGlyph):
         font_name:str[TerminusTTF-4.46.0.ttf], set name/path for font shown in glyxels
         font_size:int[12], set height of font in glyxels, ie. 12pt -> 12gx
         markup:bool[True], Rich Text inline console styling of string
+        async_update:bool[False], rasterize updates in a worker thread, latest wins
+        max_rate:float[None], maximum async slate swaps per second, None or 0 is unlimited
+        marquee:bool[False], pan the text rasterized once across the widget width
+        marquee_speed:float[8], marquee pan in cells per second
+        marquee_direction:str["left"], marquee pan "left" or "right"
+        marquee_wrap:bool[True], repeat the text after marquee_gap cells, or pan it fully out first
+        marquee_gap:int[4], cells between repeats of wrapped text
         name:str, Standard Textual Widget argument
         id:str, Standard Textual Widget argument
         classes:str, Standard Textual Widget argument
@@ -58,6 +68,13 @@ class EnGlyphText(EnGlyph):
     }
     #print( re.split( r"(:\S*?:)", "How :smile: do :big wink: you do?" ) )
 
+    _async_update = False
+    _max_rate = None
+    _marquee = False
+    _marquee_speed = 8.0
+    _marquee_direction = "left"
+    _marquee_wrap = True
+    _marquee_gap = 4
 
     def __init__(
         self,
@@ -65,6 +82,15 @@ class EnGlyphText(EnGlyph):
         **kwargs,
     ):
         self._glyph_state = deque( self._config )
+        self._maybe_default( 'async_update', False, kwargs=kwargs )
+        self._maybe_default( 'max_rate', None, kwargs=kwargs )
+        # async update bookkeeping: requested vs. shown generation of the slate
+        self._chalk_gen = 0
+        self._chalk_shown = 0
+        self._chalk_busy = False
+        self._chalk_timer = None
+        self._chalk_swapped = 0.0
+        self._marquee_reset( kwargs )
         self._maybe_default( 'text_size', 'x-small', kwargs=kwargs )
         self._maybe_reset( self, *args, kwargs=kwargs )
         super().__init__( *args, basis=self._basis, **kwargs )
@@ -73,6 +99,21 @@ class EnGlyphText(EnGlyph):
     def _text_size(self):
         return self._glyph_state[0]
 
+    def _marquee_reset(self, kwargs) -> None:
+        """Setup the attributes used for panning the slate"""
+        self._maybe_default( 'marquee', self._marquee, kwargs=kwargs )
+        self._maybe_default( 'marquee_speed', self._marquee_speed, kwargs=kwargs )
+        self._maybe_default( 'marquee_direction', self._marquee_direction, kwargs=kwargs )
+        self._maybe_default( 'marquee_wrap', self._marquee_wrap, kwargs=kwargs )
+        self._maybe_default( 'marquee_gap', self._marquee_gap, kwargs=kwargs )
+        if self._marquee_direction not in ( "left", "right" ):
+            raise ValueError( f'marquee_direction "{self._marquee_direction}" is not "left" or "right"' )
+        # (slate, width) the loop strips were cut for, the loop strips and their period
+        self._marquee_src = ( None, 0 )
+        self._marquee_loop = []
+        self._marquee_period = 1
+        self._marquee_offset = 0
+
     @_text_size.setter
     def _text_size(self, size_key: str ):
         try:
@@ -130,19 +171,28 @@ class EnGlyphText(EnGlyph):
         else:
             return Text(renderable)
 
-    def chalking( self ):
+    def chalking( self, renderable=None ):
         """A handler for processing the renderable to a slate (list of strips)"""
-        slate = Console().render_lines(self.renderable, pad=False)
+        if renderable is None:
+            renderable = self.renderable
+        slate = Console().render_lines(renderable, pad=False)
         slate_buf = []
         if self._basis == (0, 0):
             slate_buf = [Strip(strip) for strip in slate]
         else:
-            for strip in slate:
-                for seg in strip:
-                    #fallback: if only basis and font_size set, use TerminusTTF instead empty font size.
-                    pane = ToGlyxels.font_pane( seg.text, self._font_name or 'TerminusTTF-4.46.0.ttf', self._font_size)
-                    slate = ToGlyxels.pane2slate(pane, seg.style, self._basis, self._pips)
-                    slate_buf = ToGlyxels.slate_join(slate_buf, slate)
+            #fallback: if only basis and font_size set, use TerminusTTF instead empty font size.
+            font_name = self._font_name or 'TerminusTTF-4.46.0.ttf'
+            segs = [ seg for strip in slate for seg in strip ]
+            # each line and style run rasterizes on its own, possibly in parallel, joined in order
+            rows = ToGlyxels.phrases_rows(
+                [ ( seg.text, font_name, self._font_size, self._basis, self._pips ) for seg in segs ]
+            )
+            slates = [ ToGlyxels.rows2slate( seg_rows, seg.style ) for seg, seg_rows in zip( segs, rows ) ]
+            if slates:
+                slate_buf = [
+                    Strip.join( [ slate[ idx ] for slate in slates ] ).simplify()
+                    for idx in range( len( slates[0] ) )
+                ]
         return slate_buf
 
     def _preprocess(self, renderable: RenderableType | None = None, *args, **kwargs ):
@@ -158,3 +208,116 @@ class EnGlyphText(EnGlyph):
         self.renderable.stylize_before(self.rich_style)
         # raise AttributeError( "" )
         self._slate = self.chalking()
+
+    def on_mount(self) -> None:
+        super().on_mount()
+        self._marquee_timer = None
+        self._marquee_start()
+
+    def _marquee_start(self) -> None:
+        if getattr( self, '_marquee_timer', None ) is not None:
+            self._marquee_timer.stop()
+            self._marquee_timer = None
+        if self._marquee and self._marquee_speed > 0:
+            self._marquee_timer = self.set_interval( 1 / self._marquee_speed, self._marquee_step )
+
+    def _marquee_step(self) -> None:
+        self._marquee_offset += 1
+        self.refresh()
+
+    def _marquee_strips(self, width: int) -> list:
+        """Loop strips of the slate, built once per slate and width, panned by cropping"""
+        slate = self._slate
+        if self._marquee_src[0] is not slate or self._marquee_src[1] != width:
+            length = slate[0].cell_length
+            if self._marquee_wrap:
+                self._marquee_period = length + self._marquee_gap
+                copies = -(-width // max( self._marquee_period, 1 )) + 1
+                self._marquee_loop = [
+                    Strip.join( [ strip, Strip.blank( self._marquee_gap ) ] * copies ) for strip in slate
+                ]
+            else:
+                self._marquee_period = length + width
+                self._marquee_loop = [
+                    Strip.join( [ Strip.blank( width ), strip, Strip.blank( width ) ] ) for strip in slate
+                ]
+            self._marquee_period = max( self._marquee_period, 1 )
+            self._marquee_src = ( slate, width )
+        return self._marquee_loop
+
+    def get_content_width(self, container=None, viewport=None):
+        if self._marquee and container is not None:
+            return container.width
+        return super().get_content_width( container, viewport )
+
+    def render_line(self, y: int) -> Strip:
+        if not self._marquee:
+            return super().render_line( y )
+        width = self.content_size.width
+        if width <= 0 or y >= len( self._slate ):
+            return Strip.blank(0)
+        loop = self._marquee_strips( width )
+        start = self._marquee_offset % self._marquee_period
+        if self._marquee_direction == "right":
+            start = ( self._marquee_period - start ) % self._marquee_period
+        return loop[ y ].crop( start, start + width )
+
+    def update(
+        self,
+        renderable: RenderableType | None = None,
+        *args,
+        **kwargs
+    ) -> None:
+        """New display input, rasterized off the event loop when async_update is set"""
+        marquee = ( self._marquee, self._marquee_speed )
+        self._marquee_reset( kwargs )
+        if self.is_mounted and marquee != ( self._marquee, self._marquee_speed ):
+            self._marquee_start()
+        self._maybe_default( 'async_update', self._async_update, kwargs=kwargs )
+        self._maybe_default( 'max_rate', self._max_rate, kwargs=kwargs )
+        if not self._async_update or not self.is_mounted:
+            super().update( renderable, *args, **kwargs )
+            return
+        self._maybe_reset( *args, kwargs=kwargs )
+        self._maybe_default( 'basis', self._basis, kwargs=kwargs )
+        self._maybe_default( 'pips', self._pips, kwargs=kwargs )
+        if renderable is not None:
+            self._predicate = renderable
+        self._chalk_gen += 1
+        self._chalk_next()
+
+    def _chalk_next(self) -> None:
+        """Start rasterizing the latest request unless busy or rate limited"""
+        if self._chalk_busy or self._chalk_timer is not None:
+            return
+        if self._max_rate:
+            wait_s = self._chalk_swapped + 1 / self._max_rate - monotonic()
+            if wait_s > 0:
+                self._chalk_timer = self.set_timer( wait_s, self._chalk_timed )
+                return
+        renderable = self.marking( self._predicate )
+        renderable.stylize_before( self.rich_style )
+        self._chalk_busy = True
+        self._chalk_worker( renderable, self._chalk_gen )
+
+    def _chalk_timed(self) -> None:
+        self._chalk_timer = None
+        self._chalk_next()
+
+    @work(thread=True, group="chalking")
+    def _chalk_worker(self, renderable, generation: int) -> None:
+        slate = self.chalking( renderable )
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread( self._chalk_swap, renderable, slate, generation )
+
+    def _chalk_swap(self, renderable, slate, generation: int) -> None:
+        """Show a finished slate newer than the one shown, then start the latest request"""
+        self._chalk_busy = False
+        if generation > self._chalk_shown:
+            self._chalk_shown = generation
+            self.renderable = renderable
+            self._slate = slate
+            self._chalk_swapped = monotonic()
+            self.refresh(layout=True)
+        if generation < self._chalk_gen:
+            self._chalk_next()
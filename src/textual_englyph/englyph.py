@@ -1,11 +1,504 @@
 """Create large text output module for Textual with custom widget EnGlyph"""
+import weakref
+from collections import OrderedDict
+from itertools import count
+from threading import Lock, RLock, Thread, current_thread, main_thread
+from time import perf_counter
+
 from rich.console import RenderableType
+from rich.segment import Segment
 
 from textual.strip import Strip
+from textual.dom import NoScreen
+from textual.errors import NoWidget
 from textual.widget import Widget
 
 class PaneManagement():
-    pass
+    """
+    A glyxel resolution canvas upon which subscribed RGBA sources are projected in z order.
+    Only the cells under sources that changed are composited and encoded again.
+    """
+
+    def __init__( self, size=(0, 0), basis=(2, 4), pips=False, background=(0, 0, 0) ):
+        self.basis = basis
+        self.pips = pips
+        self.background = background
+        self._layers = {} # key -> [RGBA image, (x, y) glyxels, z]
+        self._cells = []
+        self._strips = []
+        self._dirty = []
+        self.size = (0, 0)
+        self.resize( size )
+
+    def resize(self, size) -> None:
+        """Set the canvas size in glyxels, rounded up to whole cells"""
+        dx, dy = self.basis
+        cols, rows = -(-size[0] // dx), -(-size[1] // dy)
+        if (cols * dx, rows * dy) == self.size:
+            return
+        self.size = (cols * dx, rows * dy)
+        self._cells = [ [None] * cols for _ in range( rows ) ]
+        self._strips = [ Strip.blank( cols ) for _ in range( rows ) ]
+        self._dirty = [ (0, 0) + self.size ]
+
+    def subscribe(self, key, image, points=(0, 0), z: int = 0) -> None:
+        """Project an image at glyxel points (x, y), higher z on top"""
+        self.unsubscribe( key )
+        self._layers[ key ] = [ image.convert("RGBA"), tuple( points[:2] ), z ]
+        self._dirty.append( self.bbox( key ) )
+
+    def update(self, key, image=None, points=None, z: int|None = None) -> None:
+        """Change the image, position or z of a subscribed source"""
+        layer = self._layers[ key ]
+        self._dirty.append( self.bbox( key ) )
+        if image is not None:
+            layer[0] = image.convert("RGBA")
+        if points is not None:
+            layer[1] = tuple( points[:2] )
+        if z is not None:
+            layer[2] = z
+        self._dirty.append( self.bbox( key ) )
+
+    def unsubscribe(self, key) -> None:
+        if key in self._layers:
+            self._dirty.append( self.bbox( key ) )
+            del self._layers[ key ]
+
+    def bbox(self, key) -> tuple:
+        image, (x, y), _ = self._layers[ key ]
+        return ( x, y, x + image.width, y + image.height )
+
+    def points(self, key) -> tuple:
+        return self._layers[ key ][1]
+
+    def source_at(self, x: int, y: int):
+        """The topmost subscribed source not transparent at glyxel (x, y), or None"""
+        for key, (image, (lx, ly), _) in sorted(
+            self._layers.items(), key=lambda item: item[1][2], reverse=True
+        ):
+            if 0 <= x - lx < image.width and 0 <= y - ly < image.height:
+                if image.getpixel( (x - lx, y - ly) )[3]:
+                    return key
+        return None
+
+    def slate(self) -> list:
+        """The composited canvas as a slate, encoding only the dirty cells"""
+        if self._dirty:
+            self._composite()
+        return self._strips or EnPipe.blank
+
+    def _composite(self) -> None:
+        from PIL import Image
+        from .toglyxels import ToGlyxels
+
+        dx, dy = self.basis
+        glyphs = ( ToGlyxels.pips_glut if self.pips else ToGlyxels.full_glut )[dx][dy]
+        layers = sorted( self._layers.values(), key=lambda layer: layer[2] )
+        dirty, self._dirty = self._dirty, []
+        done = set()
+        rows = set()
+        for x0, y0, x1, y1 in dirty:
+            # cell aligned and clipped to the canvas
+            x0, y0 = max( x0 // dx * dx, 0 ), max( y0 // dy * dy, 0 )
+            x1, y1 = min( -(-x1 // dx) * dx, self.size[0] ), min( -(-y1 // dy) * dy, self.size[1] )
+            if x1 <= x0 or y1 <= y0:
+                continue
+            region = Image.new( "RGBA", (x1 - x0, y1 - y0), tuple( self.background ) + (255,) )
+            for image, (lx, ly), _ in layers:
+                ox0, oy0 = max( x0, lx ), max( y0, ly )
+                ox1, oy1 = min( x1, lx + image.width ), min( y1, ly + image.height )
+                if ox1 > ox0 and oy1 > oy0:
+                    region.alpha_composite(
+                        image, dest=(ox0 - x0, oy0 - y0), source=(ox0 - lx, oy0 - ly, ox1 - lx, oy1 - ly)
+                    )
+            region = region.convert("RGB")
+            for y_pos in range( y0, y1, dy ):
+                for x_pos in range( x0, x1, dx ):
+                    cell = ( x_pos // dx, y_pos // dy )
+                    if cell in done:
+                        continue
+                    done.add( cell )
+                    cell_img = region.crop( (x_pos - x0, y_pos - y0, x_pos - x0 + dx, y_pos - y0 + dy) )
+                    glut_idx, glyph_sty = ToGlyxels._img4cell2vals4seg( cell_img )
+                    self._cells[ cell[1] ][ cell[0] ] = Segment( glyphs[ glut_idx ], glyph_sty )
+                rows.add( y_pos // dy )
+        for row in rows:
+            cells = self._cells[ row ]
+            if None in cells:
+                cells = [ cell or Segment( " " ) for cell in cells ]
+            self._strips[ row ] = Strip( cells )
+
+class FrameBudget():
+    """
+    An app wide memory budget for the converted frames of every EnFrames store.
+    Over budget, least recently used frames that can be recomputed from their
+    retained source are evicted, first from widgets off-screen or paused.
+    Only those frames are accounted, the slates of stores without a source never are.
+    """
+
+    # measured estimate of a conversion Segment with its own Style and Colors
+    bytes_per_segment = 600
+
+    def __init__(self):
+        self.max_cells = None
+        self.max_bytes = None
+        self.cells = 0
+        self.segments = 0
+        self.evictions = 0
+        self._lru = OrderedDict() # (frames weakref, index) -> (cells, segments)
+        self._held = {} # frames weakref -> indexes in _lru
+        self._lock = RLock()
+
+    @property
+    def bytes(self) -> int:
+        return self.segments * self.bytes_per_segment
+
+    def configure(self, max_cells: int|None = None, max_bytes: int|None = None) -> None:
+        """Set the budget in cells and/or bytes, None is unlimited"""
+        with self._lock:
+            self.max_cells = max_cells
+            self.max_bytes = max_bytes
+            self._evict()
+
+    @property
+    def limited(self) -> bool:
+        return self.max_cells is not None or self.max_bytes is not None
+
+    def add(self, frames, index: int, slate) -> None:
+        key = (frames.ref, index)
+        cells = segments = 0
+        if frames.source is None:
+            # never evictable, so never counted
+            if key in self._lru:
+                with self._lock:
+                    self._drop(key)
+            return
+        if slate is not None and slate is not EnPipe.blank:
+            for strip in slate:
+                cells += strip.cell_length
+                segments += len(strip)
+        with self._lock:
+            self._drop(key)
+            if cells:
+                self._lru[key] = (cells, segments)
+                self._held.setdefault(key[0], set()).add(index)
+                self.cells += cells
+                self.segments += segments
+                self._evict()
+
+    def touch(self, frames, index: int) -> None:
+        with self._lock:
+            key = (frames.ref, index)
+            if key in self._lru:
+                self._lru.move_to_end(key)
+
+    def purge(self, ref) -> None:
+        """Drop every frame of a garbage collected store, the EnFrames weakref callback"""
+        with self._lock:
+            for index in list(self._held.get(ref, ())):
+                self._drop((ref, index))
+
+    def _drop(self, key) -> None:
+        cost = self._lru.pop(key, None)
+        if cost is not None:
+            self.cells -= cost[0]
+            self.segments -= cost[1]
+            held = self._held.get(key[0])
+            if held is not None:
+                held.discard(key[1])
+                if not held:
+                    del self._held[key[0]]
+
+    def _over(self) -> bool:
+        return bool(
+            (self.max_cells is not None and self.cells > self.max_cells)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        )
+
+    def _evict(self) -> None:
+        in_use = {}
+        while self._over():
+            victim = fallback = None
+            dead = False
+            for key in list(self._lru):
+                frames = key[0]()
+                if frames is None:
+                    self._drop(key)
+                    dead = True
+                    continue
+                if frames.source is None or key[1] in frames.showing():
+                    continue
+                if frames not in in_use:
+                    in_use[frames] = frames.in_use()
+                if not in_use[frames]:
+                    victim = key
+                    break
+                if fallback is None:
+                    fallback = key
+            if dead:
+                continue # dropping dead frames may be enough, check again before evicting
+            victim = victim or fallback
+            frames = victim and victim[0]()
+            if frames is None:
+                break
+            frames[victim[1]] = None
+            self._drop(victim)
+            self.evictions += 1
+
+    def report(self) -> list:
+        """Each widget's share of the converted frames, a shared store split evenly, largest first"""
+        usage = {}
+        with self._lock:
+            for (ref, _), (cells, segments) in list(self._lru.items()):
+                frames = ref()
+                if frames is not None:
+                    held = usage.setdefault(frames, [0, 0, 0])
+                    held[0] += 1
+                    held[1] += cells
+                    held[2] += segments
+            total = self.max_cells or self.cells or 1
+            if self.max_cells is None and self.max_bytes:
+                total = self.max_bytes / self.bytes_per_segment
+        rows = []
+        for frames, (held, cells, segments) in usage.items():
+            owners = [pipe.owner() if pipe.owner else None for pipe in list(frames.pipes)] or [None]
+            for owner in owners:
+                rows.append({
+                    "widget": owner,
+                    "frames": len(frames),
+                    "held": held,
+                    "shared": len(owners),
+                    "cells": cells / len(owners),
+                    "bytes": segments * self.bytes_per_segment / len(owners),
+                    "share": (cells if self.max_bytes is None or self.max_cells else segments)
+                        / len(owners) / total,
+                })
+        return sorted(rows, key=lambda row: row["cells"], reverse=True)
+
+
+frame_budget = FrameBudget()
+
+
+class AdaptiveQuality():
+    """
+    Steps an animation down its ladder of degrade options while converting and rendering
+    frames overruns its share of the frame time or frames arrive late, and back up one step
+    when there is headroom again. Stepping down takes a few frames, stepping up many more.
+    """
+
+    # cumulative degrade steps, each merged over the ones before it
+    ladder = (
+        {"color_bits": 5},
+        {"fps": 0.5},
+        {"basis": (1, 2)},
+        {"fps": 0.25},
+    )
+
+    def __init__(
+        self,
+        budget: float = 0.5,
+        ladder=None,
+        metrics=None,
+        patience: int = 3,
+        recover: int = 30,
+        smoothing: float = 0.2,
+    ):
+        self.budget = budget # share of the frame time for converting and rendering a frame
+        if ladder is not None:
+            self.ladder = tuple(ladder)
+        self.metrics = metrics # callable given a dict of frame timings per frame shown
+        self.patience = patience
+        self.recover = recover
+        self.smoothing = smoothing
+        self.target = 0.1 # seconds per frame at full quality, set by the widget
+        self.level = 0
+        self.restart()
+
+    def restart(self) -> None:
+        """Forget timings, after a pause or while new frames were converted"""
+        self.cost = self.achieved = None
+        self._convert = self._render = 0.0
+        self._over = self._under = 0
+        self._last = None
+
+    def options(self, level: int|None = None) -> dict:
+        """The merged degrade options of a level, the current one by default"""
+        merged = {}
+        for step in self.ladder[: self.level if level is None else level]:
+            merged.update(step)
+        return merged
+
+    def converted(self, seconds: float) -> None:
+        self._convert += seconds
+
+    def rendered(self, seconds: float) -> None:
+        self._render += seconds
+
+    def timed(self, convert):
+        """Wrap a frame conversion to account its time"""
+        def timed_convert(*args):
+            start = perf_counter()
+            try:
+                return convert(*args)
+            finally:
+                self.converted(perf_counter() - start)
+        return timed_convert
+
+    def frame(self, decide: bool = True) -> int:
+        """Account a frame shown, returns the level step taken: -1, 0 or +1"""
+        now = perf_counter()
+        convert, render = self._convert, self._render
+        self._convert = self._render = 0.0
+        alpha = self.smoothing
+        cost = convert + render
+        self.cost = cost if self.cost is None else self.cost + alpha * (cost - self.cost)
+        if self._last is not None:
+            interval = now - self._last
+            self.achieved = interval if self.achieved is None else self.achieved + alpha * (interval - self.achieved)
+        self._last = now
+        frame_time = self.target / self.options().get("fps", 1)
+        step = 0
+        if decide:
+            late = self.achieved is not None and self.achieved > frame_time * 1.25
+            if self.cost > frame_time * self.budget or late:
+                self._over, self._under = self._over + 1, 0
+                if self._over >= self.patience and self.level < len(self.ladder):
+                    step = 1
+            elif self.cost < frame_time * self.budget / 2 and not (
+                self.achieved is not None and self.achieved > frame_time * 1.05
+            ):
+                self._over, self._under = 0, self._under + 1
+                if self._under >= self.recover and self.level > 0:
+                    step = -1
+            else:
+                self._over = self._under = 0
+        if self.metrics is not None:
+            self.metrics({
+                "level": self.level,
+                "options": self.options(),
+                "target_ms": self.target * 1000,
+                "frame_ms": frame_time * 1000,
+                "achieved_ms": None if self.achieved is None else self.achieved * 1000,
+                "cost_ms": self.cost * 1000,
+                "convert_ms": convert * 1000,
+                "render_ms": render * 1000,
+                "step": step,
+            })
+        if step:
+            self.level += step
+            self.restart()
+        return step
+
+
+class AssetLoader():
+    """
+    Runs widget asset loads on a few daemon threads, widgets showing on screen first.
+    Each load's result, or exception, is handed back to a callback on the event loop.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._pending = [] # [widget weakref, load, done, sequence]
+        self._sequence = count()
+        self._running = 0
+        self._lock = Lock()
+
+    def submit(self, widget, load, done) -> None:
+        """Call load() on a loader thread, then done(result) on the widget's event loop"""
+        widget._on_screen()
+        with self._lock:
+            self._pending.append((weakref.ref(widget), load, done, next(self._sequence)))
+            if self._running >= self.max_workers:
+                return
+            self._running += 1
+        Thread(target=self._run, name="englyph-loader", daemon=True).start()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _next(self):
+        """The earliest job of a widget on screen, else the earliest job, None when idle"""
+        with self._lock:
+            jobs = [job for job in self._pending if job[0]() is not None]
+            if not jobs:
+                self._pending = []
+                self._running -= 1
+                return None
+            job = min(jobs, key=lambda job: (not job[0]()._in_use, job[3]))
+            self._pending = [other for other in jobs if other is not job]
+            return job
+
+    def _run(self) -> None:
+        idle = False
+        try:
+            while True:
+                job = self._next()
+                if job is None:
+                    idle = True # _next released this worker
+                    return
+                ref, load, done, _ = job
+                try:
+                    result = load()
+                except Exception as error:  # pylint: disable=broad-except
+                    result = error
+                widget = ref()
+                if widget is None or not widget.is_attached:
+                    continue
+                try:
+                    widget.app.call_from_thread(self._done, done, result)
+                except Exception:  # pylint: disable=broad-except
+                    # the app stopped, or the callback failed, either way keep serving the queue
+                    continue
+        finally:
+            if not idle:
+                with self._lock:
+                    self._running -= 1
+
+    def _done(self, done, result) -> None:
+        # on screen can change while loading, look again before the next pick
+        for ref, *_ in list(self._pending):
+            widget = ref()
+            if widget is not None:
+                widget._on_screen()
+        done(result)
+
+
+asset_loader = AssetLoader()
+
+
+class EnFrames(dict):
+    """The slates of an EnPipe by index, possibly shared by several pipes"""
+
+    def __init__(self):
+        super().__init__()
+        self.ref = weakref.ref(self, frame_budget.purge)
+        # recompute an evicted slate by index from the retained source
+        self.source = None
+        # the pipes sharing these frames, each with its own index
+        self.pipes = weakref.WeakSet()
+        # all frames converted, callbacks waiting for that
+        self.complete = False
+        self.waiters = []
+
+    __hash__ = object.__hash__
+    __eq__ = object.__eq__
+
+    def showing(self) -> set:
+        return {pipe.index for pipe in list(self.pipes)}
+
+    def in_use(self) -> bool:
+        return any(pipe.in_use() for pipe in list(self.pipes))
+
+    def attached(self) -> bool:
+        """Is a widget showing these frames still in the DOM"""
+        owners = [pipe.owner() for pipe in list(self.pipes) if pipe.owner]
+        return any(owner is not None and owner.is_attached for owner in owners)
+
+    def put(self, index: int, slate) -> None:
+        self[index] = slate
+        frame_budget.add(self, index, slate)
+
 
 class EnPipe():
     """ A data structure for managing a slate(list'o'strips) sequence"""
@@ -15,24 +508,60 @@ class EnPipe():
         self.aperiodic = False
         self.interval = 100/1000
         self.index = 0
+        # the widget showing this pipe, weakly referenced
+        self.owner = None
         slate = slate or self.blank
-        self.slates = { self.index:slate }
+        self.slates = EnFrames()
+        self.slates.pipes.add( self )
+        self._put( self.index, slate )
+
+    @property
+    def source(self):
+        return self.slates.source
+
+    @source.setter
+    def source(self, source):
+        self.slates.source = source
+
+    def share(self, frames: EnFrames) -> None:
+        """Show the frames of another pipe, keeping this pipe's own index"""
+        self.slates.pipes.discard( self )
+        self.slates = frames
+        frames.pipes.add( self )
+        self.index = self.index%len(frames) if frames else 0
 
     def __iter__(self):
         return self
 
     def __setitem__(self, key:int|float, value):
         '''enable slice/index assignment'''
-        self.slates[ int(key) ] = value
+        self._put( int(key), value )
 
     def __getitem__(self, key:int|float):
         '''enable slice/index access'''
-        return self.slates[ int(key)%len(self.slates) ]
+        return self._get( int(key)%len(self.slates) )
+
+    def _put(self, index:int, slate):
+        self.slates.put( index, slate )
+
+    def _get(self, index:int):
+        slate = self.slates[ index ]
+        if slate is None:
+            self._put( index, self.source( index ) )
+            slate = self.slates[ index ]
+        elif frame_budget.limited and self.slates.source is not None:
+            frame_budget.touch( self.slates, index )
+        return slate
+
+    def in_use(self) -> bool:
+        """Is the owning widget on screen and not paused"""
+        owner = self.owner() if self.owner else None
+        return owner is not None and owner._frames_in_use()
 
     def step(self, delta:int = 1 ):
         '''return the next slate in the pipeline'''
         if self.aperiodic:
-            self.slates[ self.index ] = self.blank
+            self._put( self.index, self.blank )
         self.index = (self.index + delta)%len(self.slates)
         return self.this()
 
@@ -42,13 +571,13 @@ class EnPipe():
 
     def append(self, value):
         if value is not None:
-            self.slates[ len(self.slates) ] = value
+            self._put( len(self.slates), value )
 
     def this(self, value=None ):
         '''Optionally change and return the current slate in the pipeline'''
         if value is not None:
-            self.slates[ self.index ] = value
-        return self.slates[ self.index ]
+            self._put( self.index, value )
+        return self._get( self.index )
 
 
 class EnGlyph(Widget, inherit_bindings=False):
@@ -75,6 +604,7 @@ class EnGlyph(Widget, inherit_bindings=False):
     """
 
     dragging = False
+    _in_use = True
     #The pane prescription upon which subscribed entities are projected when in view
     view_pane = PaneManagement()
     #The bounding box in glyxels for this englyphed image
@@ -85,6 +615,7 @@ class EnGlyph(Widget, inherit_bindings=False):
         self._maybe_default( 'slate_pipe', EnPipe(), kwargs=kwargs )
         self._maybe_default( 'basis', (2,4), kwargs=kwargs )
         self._maybe_default( 'pips', False, kwargs=kwargs )
+        self._slate_pipe.owner = weakref.ref( self )
         super().__init__( *args, **kwargs )
         self._predicate = self._preprocess( renderable )
 
@@ -105,6 +636,20 @@ class EnGlyph(Widget, inherit_bindings=False):
     def get_content_height(self, container=None, viewport=None, width=None):
         return len(self._slate)
 
+    def _frames_in_use(self) -> bool:
+        """Are this widget's frames needed, it is showing on the current screen"""
+        return self._on_screen()
+
+    def _on_screen(self) -> bool:
+        """Is this widget showing on the current screen, as last seen from the event loop"""
+        if current_thread() is main_thread():
+            try:
+                self._in_use = self.is_mounted and self.display and self.screen.is_current \
+                    and bool( self.screen.find_widget( self ).visible_region )
+            except (NoScreen, NoWidget):
+                self._in_use = False
+        return self._in_use
+
     def on_mouse_move(self, event):
         if self._draggable and self.dragging:
             self.offset = self.offset + event.delta
@@ -124,7 +669,7 @@ class EnGlyph(Widget, inherit_bindings=False):
         output = self._predicate
         if not isinstance( output, str ):
             output = "Image Instance"
-        if self._slate != EnPipe().blank:
+        if self._slate != EnPipe.blank:
             output = "\n".join( [strip.text for strip in self._slate] )
         return output
 
@@ -167,7 +712,7 @@ class EnGlyph(Widget, inherit_bindings=False):
 
     def render_line(self, y: int) -> Strip:
         self._postprocess()
-        strip = EnPipe().blank
+        strip = EnPipe.blank[0]
         if y < self.get_content_height():
             strip = self._slate[y]
         return strip
@@ -0,0 +1,232 @@
+"""Headless export of EnGlyph slates to ANSI text, no running Textual app needed"""
+
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+from typing import List
+
+from rich.color import Color, ColorSystem
+from rich.segment import Segment
+from rich.style import Style
+
+from textual.strip import Strip
+
+from .toglyxels import ToGlyxels, EnLoad
+
+COLOR_SYSTEMS = {
+    "standard": ColorSystem.STANDARD,
+    "256": ColorSystem.EIGHT_BIT,
+    "truecolor": ColorSystem.TRUECOLOR,
+}
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")
+TEXT_SUFFIXES = (".txt", ".json")
+
+
+def text_slate(renderable, style=None, **kwargs) -> List[Strip]:
+    """
+    Slate of an EnGlyphText configuration without mounting it.
+    Args:
+        renderable: Rich markup string or Text to display
+        style: Rich Style or style string, stands in for the CSS color and text-style
+        kwargs: EnGlyphText Args, e.g. text_size, font_name, font_size, basis, pips, markup
+    """
+    from ._englyph_text import EnGlyphText
+
+    glyphs = EnGlyphText(renderable, **kwargs)
+    if style:
+        glyphs.renderable.stylize_before(Style.parse(style) if isinstance(style, str) else style)
+        return glyphs.chalking()
+    return glyphs._slate
+
+
+def image_slate(image, width=None, height=None, basis=(2, 4), pips=False, frame=0) -> List[Strip]:
+    """
+    Slate of an EnGlyphImage frame without mounting it.
+    Args:
+        image: PIL Image or path to it
+        width: int, width in cells to fit the image within, keeping aspect ratio
+        height: int, height in cells to fit the image within, keeping aspect ratio
+            both width and height given stretches the image, neither keeps glyxel per pixel
+        basis, pips: as for EnGlyphImage
+        frame: int, frame of an animated image
+    """
+    from PIL import ImageOps
+
+    img = EnLoad(image)
+    if frame:
+        img.seek(frame)
+    img = img.convert("RGB")
+    if width and height:
+        img = img.resize((basis[0] * width, basis[1] * height))
+    elif width or height:
+        img = ImageOps.contain(
+            img, (basis[0] * width if width else sys.maxsize, basis[1] * height if height else sys.maxsize)
+        )
+    return ToGlyxels.image2slate(img, basis=basis, pips=pips)
+
+
+def slate2ansi(slate, color_system="truecolor") -> str:
+    """ANSI escaped text of a slate, one line per strip"""
+    system = COLOR_SYSTEMS[color_system]
+    lines = []
+    for strip in slate:
+        lines.append("".join(
+            seg.style.render(seg.text, color_system=system) if seg.style else seg.text
+            for seg in Strip(strip).simplify()
+            if not seg.control
+        ))
+    return "\n".join(lines) + "\n"
+
+
+def slate2compact(slate) -> str:
+    """A compact JSON slate, one list of [text, style index] runs per strip, with styles shared"""
+    styles = {}
+    rows = []
+    for strip in slate:
+        runs = []
+        for seg in Strip(strip).simplify():
+            style = _style_name(seg.style)
+            runs.append([seg.text, styles.setdefault(style, len(styles))])
+        rows.append(runs)
+    return json.dumps({"styles": list(styles), "rows": rows}, ensure_ascii=False, separators=(",", ":"))
+
+
+def _style_name(style) -> str:
+    """A Style.parse-able name, the conversion colors (rgb_cell) are named by value"""
+    if not style:
+        return ""
+    recolor = {}
+    for attr in ("color", "bgcolor"):
+        color = getattr(style, attr)
+        if color is not None and color.triplet is not None:
+            recolor[attr] = Color.from_triplet(color.triplet)
+    return str(style + Style(**recolor))
+
+
+def compact2slate(compact: str) -> List[Strip]:
+    """The slate of a slate2compact string"""
+    data = json.loads(compact)
+    styles = [Style.parse(style) if style else None for style in data["styles"]]
+    return [Strip([Segment(text, styles[idx]) for text, idx in runs]) for runs in data["rows"]]
+
+
+def _jobs4paths(paths, out_dir):
+    """(kind, source, target, options) for each image, text file and text manifest entry,
+    targets keep the subdirectory of their source below a directory path"""
+    for path in paths:
+        if os.path.isdir(path):
+            found = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names
+                if name.lower().endswith(IMAGE_SUFFIXES + TEXT_SUFFIXES)
+            )
+        else:
+            found = [path]
+        for source in found:
+            target_dir = out_dir
+            if os.path.isdir(path):
+                target_dir = os.path.normpath(os.path.join(out_dir, os.path.relpath(os.path.dirname(source), path)))
+            stem = os.path.splitext(os.path.basename(source))[0]
+            suffix = os.path.splitext(source)[1].lower()
+            if suffix == ".json":
+                with open(source, encoding="utf-8") as fh:
+                    for idx, entry in enumerate(json.load(fh)):
+                        entry = dict(entry)
+                        name = entry.pop("name", f"{stem}_{idx}")
+                        yield ("text", entry.pop("text"), os.path.join(target_dir, name), entry)
+            elif suffix == ".txt":
+                with open(source, encoding="utf-8") as fh:
+                    yield ("text", fh.read().rstrip("\n"), os.path.join(target_dir, stem), {})
+            else:
+                yield ("image", source, os.path.join(target_dir, stem), {})
+
+
+def _export_job(job, defaults):
+    """Process pool worker, writes its own output so only a summary returns"""
+    kind, source, target, options = job
+    start = perf_counter()
+    if kind == "text":
+        options = {**defaults["text"], **options}
+        if "basis" in options:
+            options["basis"] = tuple(options["basis"])
+        slate = text_slate(source, **options)
+    else:
+        slate = image_slate(source, **{**defaults["image"], **options})
+    if defaults["format"] == "slate":
+        output, target = slate2compact(slate), target + ".slate"
+    else:
+        output, target = slate2ansi(slate, defaults["color_system"]), target + ".ans"
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    with open(target, "w", encoding="utf-8") as fh:
+        fh.write(output)
+    return target, len(output.encode("utf-8")), perf_counter() - start
+
+
+def main(argv=None) -> int:
+    """englyph_export runner method"""
+    parser = ArgumentParser(
+        prog="englyph_export",
+        description="Convert images, text files (Rich markup) and JSON text manifests "
+        "(a list of {name, text, EnGlyphText options}) to ANSI art files.",
+    )
+    parser.add_argument("paths", nargs="+", help="files or directories to convert")
+    parser.add_argument("-o", "--out-dir", default=".", help="output directory")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--format", choices=("ans", "slate"), default="ans")
+    parser.add_argument("--color-system", choices=tuple(COLOR_SYSTEMS), default="truecolor")
+    parser.add_argument("--basis", type=int, nargs=2, default=None, metavar=("X", "Y"))
+    parser.add_argument("--pips", action="store_true")
+    parser.add_argument("--width", type=int, help="image width in cells")
+    parser.add_argument("--height", type=int, help="image height in cells")
+    parser.add_argument("--text-size", default="large", help="EnGlyphText text_size")
+    parser.add_argument("--style", default=None, help="Rich style for text, e.g. 'bold green'")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    text = {"text_size": args.text_size, "style": args.style, "pips": args.pips}
+    image = {"width": args.width, "height": args.height, "pips": args.pips}
+    if args.basis:
+        text["basis"] = image["basis"] = tuple(args.basis)
+    defaults = {"text": text, "image": image, "format": args.format, "color_system": args.color_system}
+
+    start = perf_counter()
+    done = size = failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        pending = {}
+        targets = {} # output path -> the source writing it
+        for job in _jobs4paths(args.paths, args.out_dir):
+            target = os.path.normcase(os.path.abspath(job[2]))
+            if target in targets:
+                # e.g. logo.png and logo.jpg, the second would overwrite the first
+                failed += 1
+                print(
+                    f"failed {str(job[1])[:60]!r}: output {job[2]} collides with {str(targets[target])[:60]!r}",
+                    file=sys.stderr,
+                )
+                continue
+            targets[target] = job[1]
+            pending[pool.submit(_export_job, job, defaults)] = job[1]
+        for future in as_completed(pending):
+            try:
+                target, n_bytes, seconds = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                failed += 1
+                print(f"failed {str(pending[future])[:60]!r}: {error}", file=sys.stderr)
+                continue
+            done += 1
+            size += n_bytes
+            print(f"{target} {n_bytes} bytes {seconds * 1000:.0f} ms")
+    elapsed = perf_counter() - start
+    print(
+        f"{done} files, {size / 1e6:.2f} MB in {elapsed:.2f} s: "
+        f"{done / elapsed:.1f} files/s, {size / 1e6 / elapsed:.2f} MB/s, {failed} failed"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,25 +2,22 @@
 
 # pylint: disable=R0914
 # greatly simplifies structure in __init__.py
+# PIL is imported where used, so text at x-small never pays for loading it
 from typing import List
 from importlib import resources
-
-from PIL import Image, ImageFont
+from threading import local
 
 from textual.strip import Strip
 from rich.color import Color, ColorTriplet, ColorType
 from rich.segment import Segment
 from rich.style import Style
-from rich.traceback import install
-
-install()
-# raise ValueError("My message")
 
 def EnLoad( maybe_paths ):
     """
     A function to load file data into memory from a path and return that refernce.
     """
     import io
+    from PIL import Image
 
     def make_buff( path:str ):
         with open(path, "rb") as fh:
@@ -38,8 +35,32 @@ def EnLoad( maybe_paths ):
 class ToGlyxels:
     """Glyph pixels to enable user specified font based string rendering via PIL"""
 
+    # loaded fonts per thread, a FreeType face must not be shared between threads
+    _fonts = local()
+    # shared (font_name, font_size, char) -> single glyph pane
+    _glyph_panes = {}
+    # shared (font_name, font_size) -> can panes be composed from single glyphs
+    _fixed_pitch = {}
+    # shared (phrase, font_name, font_size, basis, pips) -> unstyled glyph rows
+    _phrase_rows = {}
+    phrase_rows_max = 4096
+    # phrases may be rasterized on a process pool, FreeType masks and glyxel encoding hold the GIL
+    _raster_pool = None
+    _raster_pool_workers = 0
+    # opt in with more than one worker, e.g. os.cpu_count(), the pool then spawns on first use
+    raster_workers = 1
+    # glyxels (characters * font_size**2) below which rasterizing stays in process
+    raster_min_work = 40000
+
     @staticmethod
-    def font_pane(phrase, font_name, font_size):
+    def _font(font_name, font_size):
+        """load a font asset once per thread"""
+        from PIL import ImageFont
+
+        cache = ToGlyxels._fonts.__dict__
+        font = cache.get((font_name, font_size))
+        if font is not None:
+            return font
         font_asset = resources.files().joinpath("assets", font_name)
         if not font_asset.is_file():
             raise FileNotFoundError(f'Font asset "{font_asset}" not found')
@@ -47,6 +68,12 @@ class ToGlyxels:
             font = ImageFont.truetype(font_asset, size=font_size)
         except OSError:
             raise ValueError(f'Font "{font_name}" is not supported with {font_size} font_size. Please use another font or smaller font size.')
+        cache[(font_name, font_size)] = font
+        return font
+
+    @staticmethod
+    def font_pane(phrase, font_name, font_size):
+        font = ToGlyxels._font(font_name, font_size)
 
         mask_core = font.getmask(phrase, mode="1") # PIL.ImagingCore
         w, h = mask_core.size
@@ -62,6 +89,153 @@ class ToGlyxels:
 
         return (w, h, mask)
 
+    @staticmethod
+    def cell_pane(phrase, font_name, font_size):
+        """font_pane drawn in the whole advance width by line height box, ink offset kept,
+        so the panes of single glyphs tile into the cell_pane of their phrase"""
+        from PIL import Image, ImageDraw
+
+        font = ToGlyxels._font(font_name, font_size)
+        ascent, descent = font.getmetrics()
+        w, h = round(font.getlength(phrase)), ascent + descent
+        if w == 0 or h == 0:
+            return (0, 0, [])
+        img = Image.new("L", (w, h))
+        ImageDraw.Draw(img).text((0, 0), phrase, font=font, fill=255, fontmode="1")
+        return (w, h, list(img.tobytes()))
+
+    @staticmethod
+    def glyph_pane(phrase, font_name, font_size):
+        """font_pane composed from shared single glyph panes, if the font is fixed pitch"""
+        font_key = (font_name, font_size)
+        pitch = ToGlyxels._fixed_pitch.get(font_key)
+        if pitch is None:
+            probe = "0123456789"
+            glyphs = [ToGlyxels._glyph(char, font_name, font_size) for char in probe]
+            pitch = None
+            if ToGlyxels._pane_join(glyphs) == ToGlyxels.font_pane(probe, font_name, font_size):
+                pitch = glyphs[0][:2]
+            ToGlyxels._fixed_pitch[font_key] = pitch = pitch or (0, 0)
+        glyphs = [ToGlyxels._glyph(char, font_name, font_size) for char in phrase]
+        if not phrase or pitch == (0, 0) or any(glyph[:2] != pitch for glyph in glyphs):
+            return ToGlyxels.font_pane(phrase, font_name, font_size)
+        return ToGlyxels._pane_join(glyphs)
+
+    @staticmethod
+    def _glyph(char, font_name, font_size):
+        key = (font_name, font_size, char)
+        pane = ToGlyxels._glyph_panes.get(key)
+        if pane is None:
+            pane = ToGlyxels._glyph_panes[key] = ToGlyxels.font_pane(char, font_name, font_size)
+        return pane
+
+    @staticmethod
+    def _pane_join(panes):
+        """join equal height panes side by side"""
+        h = panes[0][1]
+        mask = []
+        for row in range(h):
+            for w, _, glyph in panes:
+                mask.extend(glyph[row * w:(row + 1) * w])
+        return (sum(pane[0] for pane in panes), h, mask)
+
+    @staticmethod
+    def phrase_slate(phrase, style, font_name, font_size, basis, pips):
+        """pane2slate of a phrase, sharing unstyled glyph rows between all callers"""
+        return ToGlyxels.rows2slate(ToGlyxels.phrase_rows(phrase, font_name, font_size, basis, pips), style)
+
+    @staticmethod
+    def phrase_rows(phrase, font_name, font_size, basis, pips):
+        """unstyled glyph rows of a phrase, cached"""
+        key = (phrase, font_name, font_size, basis, pips)
+        rows = ToGlyxels._phrase_rows.get(key)
+        if rows is None:
+            rows = ToGlyxels._cache_rows(key, ToGlyxels._rasterize(key))
+        return rows
+
+    @staticmethod
+    def _cache_rows(key, rows):
+        if len(ToGlyxels._phrase_rows) >= ToGlyxels.phrase_rows_max:
+            ToGlyxels._phrase_rows.clear()
+        ToGlyxels._phrase_rows[key] = rows
+        return rows
+
+    @staticmethod
+    def _rasterize(key):
+        """glyph rows of a (phrase, font_name, font_size, basis, pips) job, in any process"""
+        phrase, font_name, font_size, basis, pips = key
+        pane = ToGlyxels.glyph_pane(phrase, font_name, font_size)
+        return ToGlyxels._pane_rows(pane, basis, pips)
+
+    @staticmethod
+    def phrases_rows(jobs, workers=None):
+        """phrase_rows of (phrase, font_name, font_size, basis, pips) jobs in order,
+        the uncached ones rasterized concurrently when there is enough work to share"""
+        workers = ToGlyxels.raster_workers if workers is None else workers
+        missing = list(dict.fromkeys(job for job in jobs if job not in ToGlyxels._phrase_rows))
+        work = sum(len(job[0]) * job[2] ** 2 for job in missing)
+        if workers > 1 and len(missing) > 1 and work >= ToGlyxels.raster_min_work:
+            pool = ToGlyxels._pool(workers)
+            chunk = max(1, len(missing) // (workers * 4))
+            for key, rows in zip(missing, pool.map(ToGlyxels._rasterize, missing, chunksize=chunk)):
+                ToGlyxels._cache_rows(key, rows)
+        return [ToGlyxels.phrase_rows(*job) for job in jobs]
+
+    @staticmethod
+    def _pool(workers):
+        """the shared raster process pool, started on first use and resized on demand"""
+        from concurrent.futures import ProcessPoolExecutor
+        import multiprocessing
+
+        pool = ToGlyxels._raster_pool
+        if pool is None or ToGlyxels._raster_pool_workers != workers:
+            if pool is not None:
+                pool.shutdown(wait=False)
+            # spawned workers, forking an app with running threads is unsafe
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            ToGlyxels._raster_pool = pool
+            ToGlyxels._raster_pool_workers = workers
+        return pool
+
+    @staticmethod
+    def rows2slate(rows, style):
+        """style unstyled glyph rows into a slate as pane2slate would"""
+        if rows == [""]:
+            return [Strip.blank(0)]
+        base_row = len(rows) - 1
+        mid_row = int(base_row / 2)
+        return [
+            Strip([Segment(row, ToGlyxels._y_style(style, 0, mid_row, base_row, y_row))])
+            for y_row, row in enumerate(rows)
+        ]
+
+    @staticmethod
+    def _pane_rows(pane, basis, pips):
+        """the glyph text of pane2slate rows, indexing the mask directly instead of via PIL"""
+        x, y, mask = pane
+        if x == 0 or y == 0:
+            return [""]
+        ToGlyxels.pane2slate((1, 1, [0]), None, basis, pips) # same basis checks
+        glyphs = (ToGlyxels.pips_glut if pips else ToGlyxels.full_glut)[basis[0]][basis[1]]
+        dx, dy = basis
+        bits = [[1 if gx else 0 for gx in mask[row * x:(row + 1) * x]] for row in range(y)]
+        pad_x = -x % dx
+        bits = [row + [0] * pad_x for row in bits] + [[0] * (x + pad_x)] * (-y % dy)
+        rows = []
+        for y_glyph in range(0, len(bits), dy):
+            cell_rows = bits[y_glyph:y_glyph + dy]
+            row = []
+            for x_glyph in range(0, x + pad_x, dx):
+                glyph_idx = 0
+                exp = 0
+                for cell_row in cell_rows:
+                    for gx in cell_row[x_glyph:x_glyph + dx]:
+                        glyph_idx |= gx << exp
+                        exp += 1
+                row.append(glyphs[glyph_idx])
+            rows.append("".join(row))
+        return rows
+
     # full infill glyxel(glyph pixel) look up table, columns x rows
     full_glut = [[], ["", "", ""], ["", "", "", "", ""]]
     full_glut[1][1] = " █"
@@ -145,6 +319,8 @@ class ToGlyxels:
     @staticmethod
     def pane2slate(pane, style: Style | None, basis, pips) -> List[List[Segment]]:
         """accept a PIL mask with dimensions (pane) and return a list of Textual strips"""
+        from PIL import Image
+
         x, y, mask = pane
         if x == 0 or y == 0:
             return [Strip.blank(0)]
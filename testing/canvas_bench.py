@@ -0,0 +1,63 @@
+"""Full-screen redraw benchmark of EnGlyphCanvas drawing versus EnGlyphImage style conversion
+
+Draws a 200x60 cell screen of shapes for every basis, then times a full redraw and
+a sprite sized change, each against image2slate of the same picture.
+
+uv run testing/canvas_bench.py [columns] [rows] [frames]
+"""
+
+import random
+import sys
+from time import perf_counter
+
+from textual_englyph._englyph_canvas import GlyxelBuffer
+from textual_englyph.toglyxels import ToGlyxels
+
+BASES = ((1, 1), (1, 2), (2, 2), (2, 3), (2, 4))
+COLORS = ("red", "green", "blue", "yellow", "white", "magenta", (40, 40, 40))
+
+
+def scene(canvas: GlyxelBuffer, frame: int) -> None:
+    """A background and bouncing shapes, moved each frame"""
+    width, height = canvas.size
+    canvas.clear()
+    rng = random.Random(7)
+    for idx in range(60):
+        x = (rng.randrange(width) + frame * (idx % 5 - 2)) % width
+        y = (rng.randrange(height) + frame * (idx % 3 - 1)) % height
+        canvas.rect(x, y, rng.randrange(4, 40), rng.randrange(4, 24), COLORS[idx % len(COLORS)])
+        canvas.line(x, y, width - x, height - y, COLORS[(idx + 3) % len(COLORS)])
+
+
+def bench(columns: int, rows: int, frames: int) -> None:
+    print(f"{columns}x{rows} cells, {frames} frames, ms per frame")
+    print(f"{'basis':>8} {'image2slate':>12} {'full redraw':>12} {'sprite move':>12}")
+    for basis in BASES:
+        canvas = GlyxelBuffer((columns * basis[0], rows * basis[1]), basis=basis)
+        GlyxelBuffer._cell_cache.clear()
+
+        scene(canvas, 0)
+        img = canvas.image()
+        start = perf_counter()
+        ToGlyxels.image2slate(img, basis=basis)
+        convert = perf_counter() - start
+
+        start = perf_counter()
+        for frame in range(frames):
+            scene(canvas, frame)
+            canvas.slate()
+        full = (perf_counter() - start) / frames
+
+        start = perf_counter()
+        for frame in range(frames):
+            canvas.rect(frame % columns, 10, 16, 16, (40, 40, 40))
+            canvas.rect(frame % columns + 1, 10, 16, 16, "red")
+            canvas.slate()
+        sprite = (perf_counter() - start) / frames
+
+        print(f"{str(basis):>8} {convert * 1000:12.1f} {full * 1000:12.1f} {sprite * 1000:12.2f}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    bench(*(args + [200, 60, 20][len(args):]))
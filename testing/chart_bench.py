@@ -0,0 +1,52 @@
+"""Per sample cost of EnGlyphChart streaming versus redrawing a chart image with image2slate
+
+Pushes three series of samples into braille and sextant charts of growing width.
+
+uv run testing/chart_bench.py [samples]
+"""
+
+import math
+import sys
+from time import perf_counter
+
+from textual_englyph._englyph_chart import EnGlyphChart
+from textual_englyph.toglyxels import ToGlyxels
+
+
+def stream(chart: EnGlyphChart, samples: int) -> float:
+    """Microseconds per sample, encoding included, painting aside"""
+    start = perf_counter()
+    for idx in range(samples):
+        chart._push((math.sin(idx / 30), math.cos(idx / 17) * 0.8, (idx % 50) / 50))
+    return (perf_counter() - start) / samples * 1e6
+
+
+def redraw(width: int, height: int) -> float:
+    """Microseconds to convert a whole chart image, as needed per sample without streaming"""
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (width * 2, height * 4))
+    draw = ImageDraw.Draw(img)
+    draw.line([(x, (math.sin(x / 30) + 1) * height * 2) for x in range(width * 2)], fill="green")
+    start = perf_counter()
+    ToGlyxels.image2slate(img, basis=(2, 4), pips=True)
+    return (perf_counter() - start) * 1e6
+
+
+def bench(samples: int) -> None:
+    print(f"{samples} samples of 3 series, us per sample")
+    print(f"{'cells':>10} {'braille':>9} {'sextant':>9} {'autoscale':>10} {'image2slate':>12}")
+    for width in (40, 200, 1000):
+        braille = stream(EnGlyphChart(size=(width, 8), series=("green", "red", "blue"), scale=(-1, 1)), samples)
+        sextant = stream(
+            EnGlyphChart(size=(width, 8), series=("green", "red", "blue"), scale=(-1, 1), basis=(2, 3), pips=False),
+            samples,
+        )
+        auto = EnGlyphChart(size=(width, 8), series=("green", "red", "blue"))
+        scaled = stream(auto, samples)
+        print(f"{f'{width}x8':>10} {braille:9.1f} {sextant:9.1f} {scaled:10.1f} {redraw(width, 8):12.0f}"
+              f"  ({auto.rescales} rescales)")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
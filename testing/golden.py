@@ -0,0 +1,295 @@
+"""Golden output corpus of every conversion path, and a runner timing engines against it
+
+The corpus holds the compact slate (toansi.slate2compact) of each case, or the exception
+type it raised, as tab separated lines in testing/golden/corpus.tsv.gz. Cases cover:
+    text:   bundled fonts at every _config/_settings size, every basis and pips, plain and styled
+    markup: EnGlyphText markup at every text_size, basis and pips
+    sevseg: EnSevSeg segment mask phrases at every basis of even pitch and pips, plain and styled,
+            in line height cells, see _sevseg_pane
+    image:  synthetic and sample images at every basis and pips
+The reference engines regenerate it; any other engine must reproduce it byte for byte.
+
+uv run testing/golden.py generate
+uv run testing/golden.py check [-e ENGINE ...] [-k SUBSTRING]
+"""
+
+import gzip
+import os
+import random
+import sys
+from argparse import ArgumentParser
+from time import perf_counter
+
+from rich.style import Style
+
+from textual_englyph import EnGlyphImage, EnGlyphSprite, EnGlyphText, EnSevSeg
+from textual_englyph.englyph import PaneManagement
+from textual_englyph.toansi import slate2compact
+from textual_englyph.toglyxels import ToGlyxels
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CORPUS = os.path.join(HERE, "golden", "corpus.tsv.gz")
+
+PHRASES = ("EnGlyph 0123", "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~ AZaz", "ÄÖü€")
+STYLES = (None, "bold underline strike overline red on #202020")
+MARKUP = (
+    "Plain",
+    "Hello [b red]World[/] and [i green]more[/] text",
+    "[on blue]x[/]y[u]zz[/] [reverse]R[/]",
+)
+# segment masks of the seven segment digits 0-9 (0x3F is the narrow 0), every mask,
+# and phrases of only narrow or blank masks, which have less ink than their cells
+DIGITS = (0x3F, 0x06, 0x5B, 0x4F, 0x66, 0x6D, 0x7D, 0x07, 0x7F, 0x6F)
+MASKS = (
+    DIGITS,
+    tuple(range(0, 256, 5)),
+    tuple(range(1, 256, 5)) + (0x3F, 0x80),
+    (0x3F,),
+    (0x3F, 0x3F),
+    (0x3F, 0x00, 0x3F),
+    (0x00,),
+)
+
+
+def bases():
+    """Every (basis, pips) with a glyph table"""
+    for pips, glut in ((False, ToGlyxels.full_glut), (True, ToGlyxels.pips_glut)):
+        for dx, column in enumerate(glut):
+            for dy, glyphs in enumerate(column):
+                if glyphs:
+                    yield (dx, dy), pips
+
+
+def fonts():
+    """Every (font, size) of the text size tables"""
+    found = set()
+    for config in (EnGlyphText._config, EnSevSeg._config):
+        for size, font, _ in config.values():
+            if font and size and size > 1:
+                found.add((font, size))
+    for slug in EnGlyphText._settings.values():
+        if slug is not None and slug.font:
+            found.add((slug.font, slug.points))
+    return sorted(found)
+
+
+def images():
+    """Synthetic and sample RGB images by name"""
+    from PIL import Image, ImageDraw
+
+    found = {"solid": Image.new("RGB", (37, 23), (200, 80, 20))}
+    found["hgradient"] = Image.frombytes(
+        "RGB", (64, 40), bytes(v for y in range(40) for x in range(64) for v in (x * 4, 255 - x * 4, y * 6))
+    )
+    found["vgradient"] = found["hgradient"].transpose(Image.Transpose.ROTATE_90)
+    checker = Image.new("RGB", (48, 32), "white")
+    checker.putdata([(0, 0, 0) if (x + y) % 2 else (255, 255, 255) for y in range(32) for x in range(48)])
+    found["checker"] = checker
+    rng = random.Random(42)
+    found["noise"] = Image.frombytes("RGB", (40, 24), bytes(rng.randrange(256) for _ in range(40 * 24 * 3)))
+    shapes = Image.new("RGB", (64, 48), (10, 10, 40))
+    draw = ImageDraw.Draw(shapes)
+    draw.ellipse((4, 4, 40, 40), fill="yellow", outline="red")
+    draw.rectangle((30, 20, 60, 44), fill=(0, 120, 255))
+    draw.line((0, 47, 63, 0), fill="white", width=2)
+    found["shapes"] = shapes
+    found["hopper"] = Image.open(os.path.join(HERE, "hopper.jpg")).convert("RGB").resize((80, 60))
+    found["twirl"] = Image.open(os.path.join(HERE, "twirl.gif")).convert("RGB").resize((48, 48))
+    found["cat"] = Image.open(os.path.join(HERE, "cats", "cat_idle.png")).convert("RGB").resize((64, 40))
+    return found
+
+
+def cases():
+    """(case id, kind, args) of the whole corpus"""
+    for font, size in fonts():
+        for basis, pips in bases():
+            for p_idx, phrase in enumerate(PHRASES):
+                for s_idx, style in enumerate(STYLES):
+                    case = f"text/{font}/{size}/{basis[0]}x{basis[1]}/{'pips' if pips else 'full'}/p{p_idx}s{s_idx}"
+                    yield case, "text", (phrase, style and Style.parse(style), font, size, basis, pips)
+    for text_size, (_, font, _) in EnGlyphText._config.items():
+        if not font:
+            continue
+        for basis, pips in bases():
+            for m_idx, markup in enumerate(MARKUP):
+                case = f"markup/{text_size}/{basis[0]}x{basis[1]}/{'pips' if pips else 'full'}/m{m_idx}"
+                yield case, "markup", (markup, text_size, basis, pips)
+    _, font, _ = EnSevSeg._config["small"]
+    for basis, pips in bases():
+        if 4 % basis[0]:
+            continue # the 8 and 4 glyxel wide masks only tile at these pitches
+        for m_idx, masks in enumerate(MASKS):
+            phrase = "".join(chr(EnSevSeg.null_pinput + mask) for mask in masks)
+            for s_idx, style in enumerate(STYLES):
+                case = f"sevseg/{basis[0]}x{basis[1]}/{'pips' if pips else 'full'}/m{m_idx}s{s_idx}"
+                yield case, "sevseg", (phrase, style and Style.parse(style), basis, pips)
+    for name, img in images().items():
+        for basis, pips in bases():
+            yield f"image/{name}/{basis[0]}x{basis[1]}/{'pips' if pips else 'full'}", "image", (img, basis, pips)
+
+
+def _pane2slate(phrase, style, font, size, basis, pips):
+    return ToGlyxels.pane2slate(ToGlyxels.font_pane(phrase, font, size), style, basis, pips)
+
+
+def _phrase_slate(phrase, style, font, size, basis, pips):
+    return ToGlyxels.phrase_slate(phrase, style, font, size, basis, pips)
+
+
+def _sequential(markup, text_size, basis, pips):
+    """EnGlyphText chalking as it was, one font_pane, pane2slate and slate_join per run"""
+    from rich.console import Console
+
+    glyphs = EnGlyphText(" ", text_size=text_size, basis=basis, pips=pips)
+    slate_buf = []
+    for strip in Console().render_lines(glyphs.marking(markup), pad=False):
+        for seg in strip:
+            pane = ToGlyxels.font_pane(seg.text, glyphs._font_name, glyphs._font_size)
+            slate_buf = ToGlyxels.slate_join(slate_buf, ToGlyxels.pane2slate(pane, seg.style, basis, pips))
+    return slate_buf
+
+
+def _chalking(markup, text_size, basis, pips):
+    return EnGlyphText(markup, text_size=text_size, basis=basis, pips=pips)._slate
+
+
+def _sevseg_pane(phrase, style, basis, pips):
+    """The whole phrase drawn in its line height cell. Unlike font_pane, which crops to the ink,
+    a phrase of only narrow masks keeps the height and offsets of the others"""
+    size, font, _ = EnSevSeg._config["small"]
+    return ToGlyxels.pane2slate(ToGlyxels.cell_pane(phrase, font, size), style, basis, pips)
+
+
+def _pinput(phrase, style, basis, pips):
+    """EnSevSeg masks tiled from the pinput table, no font rasterization fallback"""
+    slate = EnSevSeg(phrase, basis=basis, pips=pips)._pinput_slate(phrase, style)
+    if slate is None:
+        raise LookupError("mask missing from the pinput table")
+    return slate
+
+
+def _image2slate(img, basis, pips):
+    return ToGlyxels.image2slate(img, basis=basis, pips=pips)
+
+
+def _frame2slate(img, basis, pips):
+    return EnGlyphImage._frame2slate(img, 0, img.size, True, basis, pips, color_bits=8)
+
+
+def _tiled(img, basis, pips):
+    """EnGlyphImage tiled=True, every line joined from small tiles"""
+    tiles = EnGlyphImage(img, tiled=True, tile_size=(3, 2), basis=basis, pips=pips)
+    tiles._tiles_init()
+    width, height = tiles._tile_cells
+    tile_w, tile_h = tiles._tile_size
+    for ty in range(-(-height // tile_h)):
+        for tx in range(-(-width // tile_w)):
+            tiles._tile(tx, ty)
+    return [tiles.render_line(y) for y in range(height)]
+
+
+def _atlas(img, basis, pips):
+    """The second frame of a two frame EnGlyphSprite sheet, beside a mirrored frame"""
+    from PIL import Image, ImageOps
+
+    sheet = Image.new("RGB", (img.width * 2, img.height))
+    sheet.paste(ImageOps.mirror(img), (0, 0))
+    sheet.paste(img, (img.width, 0))
+    sprite = EnGlyphSprite(sheet, frames=(2, 1), basis=basis, pips=pips)
+    x, y, width, height = sprite._atlas_rects[1]
+    return sprite._sheet2slate(sprite.renderable.convert("RGB"), (x, y, x + width, y + height), img.size)
+
+
+def _pane(img, basis, pips):
+    pane = PaneManagement(img.size, basis=basis, pips=pips)
+    pane.subscribe("img", img)
+    return pane.slate()
+
+
+# engine name -> (kind, function, is reference), references generate the corpus
+ENGINES = {
+    "pane2slate": ("text", _pane2slate, True),
+    "phrase_slate": ("text", _phrase_slate, False),
+    "sequential": ("markup", _sequential, True),
+    "chalking": ("markup", _chalking, False),
+    "sevseg_pane": ("sevseg", _sevseg_pane, True),
+    "pinput": ("sevseg", _pinput, False),
+    "image2slate": ("image", _image2slate, True),
+    "pane": ("image", _pane, False),
+    "frame2slate": ("image", _frame2slate, False),
+    "tiled": ("image", _tiled, False),
+    "atlas": ("image", _atlas, False),
+}
+
+
+def run(engine: str, args) -> str:
+    """The compact slate of a case, or its exception type after a '!'"""
+    try:
+        return slate2compact(ENGINES[engine][1](*args))
+    except Exception as error:  # pylint: disable=broad-except
+        return "!" + type(error).__name__
+
+
+def generate(select: str) -> int:
+    corpus = load() if select else {}
+    references = {kind: name for name, (kind, _, ref) in ENGINES.items() if ref}
+    start = perf_counter()
+    for case, kind, args in cases():
+        if select in case:
+            corpus[case] = run(references[kind], args)
+    os.makedirs(os.path.dirname(CORPUS), exist_ok=True)
+    with gzip.open(CORPUS, "wt", encoding="utf-8", compresslevel=9) as fh:
+        for case in sorted(corpus):
+            fh.write(f"{case}\t{corpus[case]}\n")
+    print(f"{len(corpus)} cases in {perf_counter() - start:.1f} s, {os.path.getsize(CORPUS) / 1e3:.0f} kB {CORPUS}")
+    return 0
+
+
+def load() -> dict:
+    with gzip.open(CORPUS, "rt", encoding="utf-8") as fh:
+        return dict(line.rstrip("\n").split("\t", 1) for line in fh)
+
+
+def check(engines: list, select: str) -> int:
+    corpus = load()
+    todo = [(case, kind, args) for case, kind, args in cases() if select in case]
+    failed = 0
+    print(f"{'engine':>14} {'cases':>6} {'failed':>7} {'seconds':>8} {'ms/case':>8}")
+    for engine in engines:
+        kind = ENGINES[engine][0]
+        if engine == "phrase_slate":
+            ToGlyxels._phrase_rows.clear() # time it cold
+        mismatches = []
+        elapsed = 0.0
+        count = 0
+        for case, case_kind, args in todo:
+            if case_kind != kind:
+                continue
+            start = perf_counter()
+            output = run(engine, args)
+            elapsed += perf_counter() - start
+            count += 1
+            if case not in corpus:
+                mismatches.append((case, "missing from corpus, generate it"))
+            elif output != corpus[case]:
+                mismatches.append((case, output[:60]))
+        failed += len(mismatches)
+        print(f"{engine:>14} {count:6d} {len(mismatches):7d} {elapsed:8.2f} {elapsed / max(count, 1) * 1000:8.2f}")
+        for case, output in mismatches[:5]:
+            print(f"{'':>14} {case}: {output}")
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("generate", "check"))
+    parser.add_argument("-e", "--engine", action="append", choices=tuple(ENGINES), help="engines to check, default all")
+    parser.add_argument("-k", default="", help="only cases whose id contains this")
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        return generate(args.k)
+    return check(args.engine or list(ENGINES), args.k)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
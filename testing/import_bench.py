@@ -0,0 +1,45 @@
+"""Import-time benchmark guarding lazy loading of textual_englyph
+
+Each sample is a fresh interpreter so module caches do not hide the cost.
+Exits non-zero if PIL or rich.traceback leak into a plain EnGlyphText import,
+or if our own import overhead (beyond textual itself) exceeds the budget.
+
+uv run testing/import_bench.py [samples] [budget_ms]
+"""
+
+import subprocess
+import sys
+from statistics import median
+
+BASELINE = "import time; t = time.perf_counter(); import textual.widget; " \
+    "print((time.perf_counter() - t) * 1000)"
+ENGLYPH = "import sys, time; t = time.perf_counter(); " \
+    "from textual_englyph import EnGlyphText; " \
+    "print((time.perf_counter() - t) * 1000); " \
+    "print('PIL' in sys.modules, sys.excepthook is not sys.__excepthook__)"
+
+
+def sample(code: str) -> list:
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return out.stdout.split()
+
+
+def main(samples: int = 7, budget_ms: float = 15.0) -> int:
+    base_ms = median(float(sample(BASELINE)[0]) for _ in range(samples))
+    runs = [sample(ENGLYPH) for _ in range(samples)]
+    ours_ms = median(float(run[0]) for run in runs)
+    pil_loaded = runs[0][1] == "True"
+    hook_changed = runs[0][2] == "True"
+
+    print(f"textual.widget import:      {base_ms:7.1f} ms")
+    print(f"textual_englyph.EnGlyphText: {ours_ms:7.1f} ms")
+    print(f"englyph overhead:            {ours_ms - base_ms:7.1f} ms (budget {budget_ms} ms)")
+    print(f"PIL loaded: {pil_loaded}, excepthook replaced: {hook_changed}")
+
+    failed = pil_loaded or hook_changed or ours_ms - base_ms > budget_ms
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    sys.exit(main(int(args[0]) if args else 7, float(args[1]) if args[1:] else 15.0))
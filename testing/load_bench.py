@@ -0,0 +1,74 @@
+"""First paint of many EnGlyphImage widgets, loaded in compose versus async_load
+
+Writes rotated copies of hopper.jpg to a temporary directory and mounts them headless.
+
+uv run testing/load_bench.py [images] [loader threads]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from PIL import Image
+from textual.app import App, ComposeResult
+from textual.containers import VerticalScroll
+from textual_englyph import EnGlyphImage
+from textual_englyph.englyph import asset_loader
+
+
+class Gallery(App):
+    """A scrolling column of images"""
+
+    DEFAULT_CSS = """
+    EnGlyphImage {
+        height: 8;
+    }
+    """
+
+    def __init__(self, paths: list, async_load: bool):
+        super().__init__()
+        self.paths = paths
+        self.async_load = async_load
+
+    def compose(self) -> ComposeResult:
+        with VerticalScroll():
+            for path in self.paths:
+                yield EnGlyphImage(path, async_load=self.async_load)
+
+
+async def bench(paths: list, async_load: bool) -> None:
+    start = perf_counter()
+    app = Gallery(paths, async_load)
+    async with app.run_test(size=(80, 30)) as pilot:
+        first = perf_counter() - start
+        images = list(app.query(EnGlyphImage))
+        while any(image._load_pending is not None for image in images):
+            await pilot.pause(0.01)
+        done = perf_counter() - start
+    label = "async_load" if async_load else "compose"
+    print(f"{label:>10}: first paint {first * 1000:6.0f} ms, all shown {done * 1000:6.0f} ms")
+    if async_load:
+        latency = sorted(image.load_latency for image in images)
+        print(f"{'':>10}  load latency min {latency[0] * 1000:.0f} ms, "
+              f"median {latency[len(latency) // 2] * 1000:.0f} ms, max {latency[-1] * 1000:.0f} ms")
+
+
+def main(images: int, threads: int) -> None:
+    asset_loader.max_workers = threads
+    source = Image.open(os.path.join(os.path.dirname(__file__), "hopper.jpg"))
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for idx in range(images):
+            path = os.path.join(tmp, f"hopper{idx}.png")
+            source.rotate(idx * 9).save(path)
+            paths.append(path)
+        print(f"{images} images, {threads} loader threads")
+        asyncio.run(bench(paths, False))
+        asyncio.run(bench(paths, True))
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [40, 4][len(args):]))
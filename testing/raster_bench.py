@@ -0,0 +1,67 @@
+"""Speedup of EnGlyphText rasterization as raster worker processes are added
+
+Renders a paragraph of xxx-large text with a markup run per word, timing chalking
+with the line and style run jobs rasterized in process and on 2, 4 ... workers.
+Worker counts past the usable cores are still run, and marked, as they can only
+show the pool overhead; the speedup needs a machine with that many cores.
+
+uv run testing/raster_bench.py [words] [repeats] [most workers, default cores or 4]
+"""
+
+import os
+import random
+import sys
+from time import perf_counter
+
+from textual_englyph import EnGlyphText
+from textual_englyph.toglyxels import ToGlyxels
+
+STYLES = ("bold red", "italic green", "underline blue", "reverse", "yellow", "magenta on black")
+
+
+def paragraph(words: int, seed: int) -> str:
+    """Markup with a style run per word, words unlike other paragraphs so nothing is cached"""
+    rng = random.Random(seed)
+    text = []
+    for idx in range(words):
+        word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(rng.randint(3, 9)))
+        text.append(f"[{STYLES[idx % len(STYLES)]}]{word}[/] ")
+    return "".join(text)
+
+
+def cores() -> int:
+    """Cores this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def bench(words: int, repeats: int, most: int) -> None:
+    counts = [1]
+    while counts[-1] * 2 <= most:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != most:
+        counts.append(most)
+    usable = cores()
+    print(f"{words} words xxx-large, {repeats} paragraphs, {usable} usable cores")
+    base = None
+    seed = 0
+    for workers in counts:
+        ToGlyxels.raster_workers = workers
+        # start the pool and warm each worker's fonts outside the timing
+        seed += 1
+        EnGlyphText(paragraph(words, seed), text_size="xxx-large")
+        start = perf_counter()
+        for _ in range(repeats):
+            seed += 1
+            EnGlyphText(paragraph(words, seed), text_size="xxx-large")
+        elapsed = (perf_counter() - start) / repeats
+        base = base or elapsed
+        note = "  (more workers than cores)" if workers > usable else ""
+        print(f"{workers:3d} workers: {elapsed * 1000:8.1f} ms per paragraph, {base / elapsed:4.2f}x{note}")
+    ToGlyxels.raster_workers = 1
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    bench(*(args + [200, 5, max(cores(), 4)][len(args):]))
@@ -0,0 +1,68 @@
+"""Throughput benchmark of EnSevSeg updates, one by one versus batch_update
+
+Mounts a wall of readouts headless and pushes random values at them.
+
+uv run testing/sevseg_bench.py [widgets] [ticks]
+"""
+
+import asyncio
+import random
+import sys
+from time import perf_counter
+
+from textual.app import App, ComposeResult
+from textual.containers import Grid
+from textual_englyph import EnSevSeg
+
+
+class Wall(App):
+    """A grid of seven segment readouts"""
+
+    DEFAULT_CSS = """
+    Grid {
+        grid-size: 20;
+    }
+    """
+
+    def __init__(self, widgets: int):
+        super().__init__()
+        self.widgets = widgets
+
+    def compose(self) -> ComposeResult:
+        with Grid():
+            for idx in range(self.widgets):
+                yield EnSevSeg("0.00", id=f"r{idx}")
+
+
+def values(n: int) -> list:
+    """About a third of the readouts keep their value each tick"""
+    return [f"{random.choice((1.0, random.random() * 100)):5.2f}" for _ in range(n)]
+
+
+async def bench(widgets: int, ticks: int) -> None:
+    app = Wall(widgets)
+    async with app.run_test(size=(200, 60)) as pilot:
+        wall = list(app.query(EnSevSeg))
+
+        start = perf_counter()
+        for _ in range(ticks):
+            for widget, value in zip(wall, values(widgets)):
+                if value != widget._predicate:
+                    widget.update(value)
+            await pilot.pause()
+        single = widgets * ticks / (perf_counter() - start)
+
+        start = perf_counter()
+        for _ in range(ticks):
+            EnSevSeg.batch_update(zip(wall, values(widgets)))
+            await pilot.pause()
+        batch = widgets * ticks / (perf_counter() - start)
+
+    print(f"{widgets} readouts x {ticks} ticks")
+    print(f"update():       {single:9.0f} updates/s")
+    print(f"batch_update(): {batch:9.0f} updates/s ({batch / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(bench(*(args + [300, 8][len(args):])))